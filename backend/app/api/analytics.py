@@ -0,0 +1,68 @@
+from collections import defaultdict
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import Dict, Optional
+from database.database import get_read_db
+from app.models.booking_rollup import BookingRollup
+from app.models.meeting import MeetingStatus
+from app.schemas.analytics import BookingAnalytics, BookingCounts, DailyBookingStats, EventTypeBookingStats
+
+router = APIRouter()
+
+@router.get("/bookings", response_model=BookingAnalytics)
+async def get_booking_analytics(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    event_type_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Booking counts and cancellation rates per event type and per day, for the
+    meetings scheduled between start_date and end_date (UTC dates, inclusive).
+    Read from the daily rollups, so the cost grows with the number of days,
+    not the number of meetings.
+    """
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date")
+    
+    query = select(BookingRollup.event_type_id, BookingRollup.date, BookingRollup.status, BookingRollup.count)
+    if start_date:
+        query = query.where(BookingRollup.date >= start_date)
+    if end_date:
+        query = query.where(BookingRollup.date <= end_date)
+    if event_type_id is not None:
+        query = query.where(BookingRollup.event_type_id == event_type_id)
+    
+    by_event_type: Dict[int, Dict[MeetingStatus, int]] = defaultdict(lambda: defaultdict(int))
+    by_date: Dict[date, Dict[MeetingStatus, int]] = defaultdict(lambda: defaultdict(int))
+    totals: Dict[MeetingStatus, int] = defaultdict(int)
+    for row_event_type_id, row_date, row_status, count in await db.execute(query):
+        by_event_type[row_event_type_id][row_status] += count
+        by_date[row_date][row_status] += count
+        totals[row_status] += count
+    
+    return BookingAnalytics(
+        start_date=start_date,
+        end_date=end_date,
+        totals=BookingCounts(**_counts(totals)),
+        event_types=[
+            EventTypeBookingStats(event_type_id=key, **_counts(counts))
+            for key, counts in sorted(by_event_type.items())
+            if any(counts.values())
+        ],
+        days=[
+            DailyBookingStats(date=key, **_counts(counts))
+            for key, counts in sorted(by_date.items())
+            if any(counts.values())
+        ]
+    )
+
+def _counts(counts: Dict[MeetingStatus, int]) -> dict:
+    """Fields of BookingCounts from the number of meetings in each status"""
+    fields = {meeting_status.value: counts.get(meeting_status, 0) for meeting_status in MeetingStatus}
+    total = sum(fields.values())
+    fields["total"] = total
+    fields["cancellation_rate"] = round(fields["cancelled"] / total, 4) if total else 0.0
+    return fields
@@ -1,31 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from database.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Tuple
+from database.database import get_db, get_read_db
 from app.models.availability import AvailabilitySchedule
 from app.models.event_type import EventType
-from app.schemas.availability import AvailabilitySchedule as AvailabilitySchema, AvailabilityScheduleCreate, AvailabilityScheduleUpdate
+from app.schemas.availability import (
+    AvailabilitySchedule as AvailabilitySchema, AvailabilityScheduleCreate, AvailabilityScheduleItem, AvailabilityScheduleUpdate
+)
+from app.services.event_type_cache import event_type_cache
+from app.services.http_cache import REVALIDATE, availability_etag, etag_matches
+from app.services.schedule_cache import schedule_cache
+from app.services.slot_cache import slot_cache
+from app.services.slot_events import slot_events
 
 router = APIRouter()
 
 @router.get("/event-type/{event_type_id}", response_model=List[AvailabilitySchema])
-def get_availability_for_event_type(event_type_id: int, db: Session = Depends(get_db)):
-    """Get all availability schedules for an event type"""
+async def get_availability_for_event_type(
+    event_type_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get all availability schedules for an event type.
+    The ETag is the event type's availability revision, read from the database
+    rather than the event type cache, so a matching If-None-Match is answered
+    with 304 without querying the schedules.
+    """
     # Verify event type exists
-    event_type = db.query(EventType).filter(EventType.id == event_type_id).first()
-    if not event_type:
+    event_type = (await db.execute(
+        select(EventType.id, EventType.availability_revision).where(EventType.id == event_type_id)
+    )).first()
+    if event_type is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
     
-    schedules = db.query(AvailabilitySchedule).filter(
+    headers = {"ETag": availability_etag(event_type), "Cache-Control": REVALIDATE}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    schedules = (await db.scalars(select(AvailabilitySchedule).where(
         AvailabilitySchedule.event_type_id == event_type_id
-    ).all()
+    ).order_by(AvailabilitySchedule.id))).all()
+    response.headers.update(headers)
     return schedules
 
 @router.post("/", response_model=AvailabilitySchema, status_code=status.HTTP_201_CREATED)
-def create_availability(availability: AvailabilityScheduleCreate, db: Session = Depends(get_db)):
+async def create_availability(availability: AvailabilityScheduleCreate, db: AsyncSession = Depends(get_db)):
     """Create a new availability schedule"""
     # Verify event type exists
-    event_type = db.query(EventType).filter(EventType.id == availability.event_type_id).first()
+    event_type = await event_type_cache.get_by_id(db, availability.event_type_id)
     if not event_type:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
     
@@ -39,17 +64,19 @@ def create_availability(availability: AvailabilityScheduleCreate, db: Session =
     
     db_availability = AvailabilitySchedule(**availability.model_dump())
     db.add(db_availability)
-    db.commit()
-    db.refresh(db_availability)
+    await _bump_revision(db, [db_availability.event_type_id])
+    await db.commit()
+    await db.refresh(db_availability)
+    _availability_changed(db_availability.event_type_id)
     return db_availability
 
 @router.post("/bulk", response_model=List[AvailabilitySchema], status_code=status.HTTP_201_CREATED)
-def create_bulk_availability(availabilities: List[AvailabilityScheduleCreate], db: Session = Depends(get_db)):
+async def create_bulk_availability(availabilities: List[AvailabilityScheduleCreate], db: AsyncSession = Depends(get_db)):
     """Create multiple availability schedules at once"""
     created = []
     for availability in availabilities:
         # Verify event type exists
-        event_type = db.query(EventType).filter(EventType.id == availability.event_type_id).first()
+        event_type = await event_type_cache.get_by_id(db, availability.event_type_id)
         if not event_type:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, 
                               detail=f"Event type {availability.event_type_id} not found")
@@ -68,15 +95,71 @@ def create_bulk_availability(availabilities: List[AvailabilityScheduleCreate], d
         db.add(db_availability)
         created.append(db_availability)
     
-    db.commit()
+    await _bump_revision(db, {av.event_type_id for av in created})
+    await db.commit()
     for av in created:
-        db.refresh(av)
+        await db.refresh(av)
+    for event_type_id in {av.event_type_id for av in created}:
+        _availability_changed(event_type_id)
     return created
 
+@router.put("/event-type/{event_type_id}", response_model=List[AvailabilitySchema])
+async def replace_availability_for_event_type(
+    event_type_id: int,
+    schedules: List[AvailabilityScheduleItem],
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Replace the weekly schedule of an event type in one transaction.
+    The new schedule is diffed against the existing rows, so only the rows that
+    changed are inserted, updated or deleted, with one statement each.
+    """
+    # Validate the whole batch before touching anything
+    for schedule in schedules:
+        if schedule.day_of_week < 0 or schedule.day_of_week > 6:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="day_of_week must be between 0 and 6")
+        if schedule.start_time >= schedule.end_time:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_time must be before end_time")
+    
+    # Verify event type exists, locking it so concurrent replacements of the
+    # same schedule run one after the other
+    event_type = await db.scalar(select(EventType.id).where(EventType.id == event_type_id).with_for_update())
+    if event_type is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
+    
+    existing = (await db.scalars(select(AvailabilitySchedule).where(
+        AvailabilitySchedule.event_type_id == event_type_id
+    ))).all()
+    
+    inserts, updates, deletes = _diff_schedules(existing, schedules)
+    
+    if updates:
+        await db.execute(update(AvailabilitySchedule), updates)
+    if inserts:
+        await db.execute(insert(AvailabilitySchedule), [
+            {"event_type_id": event_type_id, **schedule.model_dump()} for schedule in inserts
+        ])
+    if deletes:
+        await db.execute(delete(AvailabilitySchedule).where(AvailabilitySchedule.id.in_(deletes)))
+    if inserts or updates or deletes:
+        await _bump_revision(db, [event_type_id])
+    
+    result = (await db.scalars(
+        select(AvailabilitySchedule).where(
+            AvailabilitySchedule.event_type_id == event_type_id
+        ).order_by(AvailabilitySchedule.day_of_week, AvailabilitySchedule.start_time, AvailabilitySchedule.id)
+        .execution_options(populate_existing=True)
+    )).all()
+    await db.commit()
+    
+    if inserts or updates or deletes:
+        _availability_changed(event_type_id)
+    return result
+
 @router.put("/{availability_id}", response_model=AvailabilitySchema)
-def update_availability(availability_id: int, availability: AvailabilityScheduleUpdate, db: Session = Depends(get_db)):
+async def update_availability(availability_id: int, availability: AvailabilityScheduleUpdate, db: AsyncSession = Depends(get_db)):
     """Update an availability schedule"""
-    db_availability = db.query(AvailabilitySchedule).filter(AvailabilitySchedule.id == availability_id).first()
+    db_availability = await db.get(AvailabilitySchedule, availability_id)
     if not db_availability:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Availability schedule not found")
     
@@ -96,26 +179,100 @@ def update_availability(availability_id: int, availability: AvailabilitySchedule
     for field, value in update_data.items():
         setattr(db_availability, field, value)
     
-    db.commit()
-    db.refresh(db_availability)
+    await _bump_revision(db, [db_availability.event_type_id])
+    await db.commit()
+    await db.refresh(db_availability)
+    _availability_changed(db_availability.event_type_id)
     return db_availability
 
 @router.delete("/{availability_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_availability(availability_id: int, db: Session = Depends(get_db)):
+async def delete_availability(availability_id: int, db: AsyncSession = Depends(get_db)):
     """Delete an availability schedule"""
-    db_availability = db.query(AvailabilitySchedule).filter(AvailabilitySchedule.id == availability_id).first()
+    db_availability = await db.get(AvailabilitySchedule, availability_id)
     if not db_availability:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Availability schedule not found")
     
-    db.delete(db_availability)
-    db.commit()
+    event_type_id = db_availability.event_type_id
+    await db.delete(db_availability)
+    await _bump_revision(db, [event_type_id])
+    await db.commit()
+    _availability_changed(event_type_id)
     return None
 
 @router.delete("/event-type/{event_type_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_all_availability_for_event_type(event_type_id: int, db: Session = Depends(get_db)):
+async def delete_all_availability_for_event_type(event_type_id: int, db: AsyncSession = Depends(get_db)):
     """Delete all availability schedules for an event type"""
-    db.query(AvailabilitySchedule).filter(
+    await db.execute(delete(AvailabilitySchedule).where(
         AvailabilitySchedule.event_type_id == event_type_id
-    ).delete()
-    db.commit()
+    ))
+    await _bump_revision(db, [event_type_id])
+    await db.commit()
+    _availability_changed(event_type_id)
     return None
+
+async def _bump_revision(db: AsyncSession, event_type_ids) -> None:
+    """Bump the availability revision of event types in the current transaction"""
+    await db.execute(
+        update(EventType)
+        .where(EventType.id.in_(set(event_type_ids)))
+        # Keep updated_at, which tracks changes to the event type itself
+        .values(availability_revision=EventType.availability_revision + 1, updated_at=EventType.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+def _availability_changed(event_type_id: int) -> None:
+    """Drop everything cached from an event type's availability after a write committed"""
+    event_type_cache.invalidate(event_type_id)
+    schedule_cache.invalidate(event_type_id)
+    slot_cache.invalidate_event_type(event_type_id)
+    slot_events.publish_resync(event_type_id)
+
+def _diff_schedules(
+    existing: List[AvailabilitySchedule],
+    schedules: List[AvailabilityScheduleItem]
+) -> Tuple[List[AvailabilityScheduleItem], List[dict], List[int]]:
+    """
+    Work out the statements that turn the existing rows into the new schedule.
+    Rows that already match an entry are kept as they are, and leftover rows
+    are reused for leftover entries, preferring rows on the same day, so
+    editing a time updates a row instead of deleting and inserting one.
+    Returns the entries to insert, the updates by primary key and the ids to delete.
+    """
+    def key(schedule) -> Tuple:
+        return (schedule.day_of_week, schedule.start_time, schedule.end_time, schedule.timezone)
+    
+    unmatched_rows: Dict[Tuple, List[AvailabilitySchedule]] = {}
+    for row in sorted(existing, key=lambda row: row.id):
+        unmatched_rows.setdefault(key(row), []).append(row)
+    
+    # Keep the rows that are already in the schedule, dropping duplicate entries
+    wanted = []
+    seen = set()
+    for schedule in schedules:
+        if key(schedule) in seen:
+            continue
+        seen.add(key(schedule))
+        if unmatched_rows.get(key(schedule)):
+            unmatched_rows[key(schedule)].pop(0)
+        else:
+            wanted.append(schedule)
+    
+    leftover_rows = [row for rows in unmatched_rows.values() for row in rows]
+    updates = []
+    
+    # Reuse leftover rows, first on the same day and then on any day
+    for same_day in (True, False):
+        remaining = []
+        for schedule in wanted:
+            row = next(
+                (row for row in leftover_rows if not same_day or row.day_of_week == schedule.day_of_week),
+                None
+            )
+            if row is None:
+                remaining.append(schedule)
+                continue
+            leftover_rows.remove(row)
+            updates.append({"id": row.id, **schedule.model_dump()})
+        wanted = remaining
+    
+    return wanted, updates, [row.id for row in leftover_rows]
@@ -1,31 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from datetime import date, datetime
-from typing import List
+from collections import Counter
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
 import pytz
-from database.database import get_db
-from app.models.event_type import EventType
+import time
+from database.database import ReadSessionLocal, get_db, get_read_db, is_lock_conflict, reads_replica
 from app.models.meeting import Meeting, MeetingStatus
-from app.schemas.meeting import MeetingCreate, Meeting as MeetingSchema
-from app.services.booking_service import get_available_time_slots, is_time_slot_available
+from app.schemas.meeting import BulkBookingReport, MeetingCreate, Meeting as MeetingSchema
+from app.schemas.event_type import EventType as EventTypeSchema
+from app.services.booking_rollups import apply_changes, rollup_key
+from app.services.booking_service import (
+    _to_utc, get_available_time_slots_for_range, is_time_slot_available, lock_host
+)
+from app.services.bulk_booking import validate_booking_batch
+from app.services.event_type_cache import event_type_cache
+from app.services.schedule_cache import _merge_intervals
+from app.services.single_flight import slot_flights
+from app.services.slot_cache import meeting_dates, slot_cache
+from app.services.slot_events import SLOT_TAKEN, slot_events
 
 router = APIRouter()
 
+# Longest window the range mode of the slots endpoint will compute in one call
+MAX_SLOT_RANGE_DAYS = 62
+
+# Most rows a single bulk import may contain
+MAX_BULK_BOOKINGS = 10000
+
 @router.get("/available/{event_type_slug}")
-def get_available_slots(
+async def get_available_slots(
     event_type_slug: str,
-    date: date,
+    date: Optional[date] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
     timezone: str = "UTC",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get available time slots for an event type on a specific date"""
+    """Get available time slots for an event type on a specific date or date range"""
+    if date is None and (start_date is None or end_date is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either date or both start_date and end_date"
+        )
+    if date is None:
+        if end_date < start_date:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date")
+        if (end_date - start_date).days >= MAX_SLOT_RANGE_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Date range must not exceed {MAX_SLOT_RANGE_DAYS} days"
+            )
+    if timezone not in pytz.all_timezones_set:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown timezone: {timezone}")
+    
     # Get event type by slug
-    event_type = db.query(EventType).filter(EventType.slug == event_type_slug).first()
+    event_type = await event_type_cache.get_by_slug(db, event_type_slug)
     if not event_type:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
+    # Slots are computed on a session of their own; give this one's connection
+    # back first, so a request waiting on the computation doesn't hold a second one
+    await db.close()
+    
+    if date is None:
+        # Get available slots for every day of the range, grouped by date
+        slots_by_date = await _get_cached_slots(event_type, start_date, end_date, timezone)
+        
+        return {
+            "event_type_id": event_type.id,
+            "event_type_name": event_type.name,
+            "duration_minutes": event_type.duration_minutes,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "timezone": timezone,
+            "available_slots": {
+                day.isoformat(): [slot.isoformat() for slot in slots]
+                for day, slots in slots_by_date.items()
+            }
+        }
     
     # Get available slots
-    slots = get_available_time_slots(db, event_type.id, date, timezone)
+    slots = (await _get_cached_slots(event_type, date, date, timezone))[date]
     
     return {
         "event_type_id": event_type.id,
@@ -36,39 +95,232 @@ def get_available_slots(
         "available_slots": [slot.isoformat() for slot in slots]
     }
 
-@router.post("/", response_model=MeetingSchema, status_code=status.HTTP_201_CREATED)
-def create_booking(booking: MeetingCreate, db: Session = Depends(get_db)):
-    """Create a new booking"""
-    # Get event type
-    event_type = db.query(EventType).filter(EventType.id == booking.event_type_id).first()
+@router.get("/available/{event_type_slug}/events")
+async def stream_slot_events(
+    event_type_slug: str,
+    request: Request,
+    start_date: date,
+    end_date: date,
+    timezone: str = "UTC"
+):
+    """
+    Server-Sent Events stream of the changes to the slots of an event type
+    between start_date and end_date (dates in timezone, inclusive), so the
+    booking page can stop polling the slots endpoint.
+    
+    slot_taken and slot_freed carry the start and end of the time that became
+    busy or free, in UTC; resync asks the client to fetch the whole range again.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_date must not be after end_date")
+    if (end_date - start_date).days >= MAX_SLOT_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must not exceed {MAX_SLOT_RANGE_DAYS} days"
+        )
+    if timezone not in pytz.all_timezones_set:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown timezone: {timezone}")
+    
+    # A session of its own, released before streaming: a request dependency
+    # would hold a connection for as long as the stream stays open
+    async with ReadSessionLocal() as db:
+        event_type = await event_type_cache.get_by_slug(db, event_type_slug)
     if not event_type:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
     
-    # Ensure scheduled_at is timezone-aware (UTC)
-    scheduled_at = booking.scheduled_at
-    if scheduled_at.tzinfo is None:
-        scheduled_at = pytz.UTC.localize(scheduled_at)
-    else:
-        scheduled_at = scheduled_at.astimezone(pytz.UTC)
+    tz = pytz.timezone(timezone)
+    subscription = slot_events.subscribe(
+        event_type.id,
+        tz.localize(datetime.combine(start_date, datetime.min.time())),
+        tz.localize(datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+    )
+    # A reconnecting client may have missed events while it was away
+    resync_first = request.headers.get("last-event-id") is not None
+    
+    return StreamingResponse(
+        slot_events.stream(subscription, resync_first),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/", response_model=MeetingSchema, status_code=status.HTTP_201_CREATED)
+async def create_booking(booking: MeetingCreate, db: AsyncSession = Depends(get_db)):
+    """Create a new booking"""
+    if booking.timezone not in pytz.all_timezones_set:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown timezone: {booking.timezone}")
     
-    # Check if time slot is available
-    if not is_time_slot_available(db, booking.event_type_id, scheduled_at, event_type.duration_minutes):
+    async with _booking_transaction(db):
+        # Get event type
+        event_type = await event_type_cache.get_by_id(db, booking.event_type_id)
+        if not event_type:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
+        
+        # Ensure scheduled_at is timezone-aware (UTC)
+        scheduled_at = booking.scheduled_at
+        if scheduled_at.tzinfo is None:
+            scheduled_at = pytz.UTC.localize(scheduled_at)
+        else:
+            scheduled_at = scheduled_at.astimezone(pytz.UTC)
+        
+        # Check if time slot is available; under the host lock, no other
+        # booking can take the time between this check and the commit
+        if not await is_time_slot_available(
+            db, booking.event_type_id, scheduled_at, event_type.duration_minutes, booking.timezone, event_type=event_type
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Time slot is not available or conflicts with an existing booking"
+            )
+        
+        # Create meeting
+        db_meeting = Meeting(
+            event_type_id=booking.event_type_id,
+            invitee_name=booking.invitee_name,
+            invitee_email=booking.invitee_email,
+            scheduled_at=scheduled_at,
+            ends_at=scheduled_at + timedelta(minutes=event_type.duration_minutes),
+            status=MeetingStatus.SCHEDULED
+        )
+        
+        db.add(db_meeting)
+        await db.flush()
+        
+        await apply_changes(db, Counter([rollup_key(booking.event_type_id, scheduled_at, MeetingStatus.SCHEDULED)]))
+        await db.commit()
+    await db.refresh(db_meeting)
+    
+    slot_cache.invalidate_meeting(db_meeting.scheduled_at, db_meeting.ends_at)
+    slot_events.publish_busy_change(SLOT_TAKEN, db_meeting.scheduled_at, db_meeting.ends_at)
+    
+    return db_meeting
+
+@router.post("/bulk", response_model=BulkBookingReport)
+async def create_bulk_bookings(bookings: List[MeetingCreate], db: AsyncSession = Depends(get_db)):
+    """
+    Import a batch of bookings, e.g. when migrating from another scheduler.
+    Each row is accepted or rejected on its own; the accepted rows are inserted
+    together and the response reports the outcome of every row.
+    """
+    if len(bookings) > MAX_BULK_BOOKINGS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Time slot is not available or conflicts with an existing booking"
+            detail=f"A batch must not exceed {MAX_BULK_BOOKINGS} bookings"
         )
     
-    # Create meeting
-    db_meeting = Meeting(
-        event_type_id=booking.event_type_id,
-        invitee_name=booking.invitee_name,
-        invitee_email=booking.invitee_email,
-        scheduled_at=scheduled_at,
-        status=MeetingStatus.SCHEDULED
+    async with _booking_transaction(db):
+        results, rows = await validate_booking_batch(db, bookings)
+        
+        if rows:
+            # One executemany for the whole batch
+            await db.execute(insert(Meeting), rows)
+            await apply_changes(db, Counter(
+                rollup_key(row["event_type_id"], row["scheduled_at"], MeetingStatus.SCHEDULED) for row in rows
+            ))
+            
+            # Look the new ids up by slot; the batch was validated under the host
+            # lock, so no other scheduled meeting of the event type starts there
+            inserted = await db.execute(select(Meeting.id, Meeting.event_type_id, Meeting.scheduled_at).where(
+                Meeting.event_type_id.in_({row["event_type_id"] for row in rows}),
+                Meeting.status == MeetingStatus.SCHEDULED,
+                Meeting.scheduled_at >= min(row["scheduled_at"] for row in rows),
+                Meeting.scheduled_at <= max(row["scheduled_at"] for row in rows)
+            ))
+            ids_by_slot = {
+                (event_type_id, _to_utc(scheduled_at)): meeting_id
+                for meeting_id, event_type_id, scheduled_at in inserted
+            }
+        await db.commit()
+    
+    if rows:
+        accepted = iter(rows)
+        for result in results:
+            if result.accepted:
+                row = next(accepted)
+                result.meeting_id = ids_by_slot.get((row["event_type_id"], row["scheduled_at"]))
+        
+        # The new meetings block these dates for every event type
+        slot_cache.invalidate_dates({
+            day for row in rows for day in meeting_dates(row["scheduled_at"], row["ends_at"])
+        })
+        # One event per run of back-to-back meetings rather than one per row
+        for start, end in _merge_intervals((row["scheduled_at"], row["ends_at"]) for row in rows):
+            slot_events.publish_busy_change(SLOT_TAKEN, start, end)
+    
+    return BulkBookingReport(
+        accepted=len(rows),
+        rejected=len(results) - len(rows),
+        results=results
     )
+
+@asynccontextmanager
+async def _booking_transaction(db: AsyncSession):
+    """
+    Run the body under the host's booking lock, which it keeps until it
+    commits; an error in the body rolls back and releases it. A transaction
+    that still loses a lock to another one (a lock wait timeout, or a
+    deadlock with a cancellation or the background jobs) is rolled back and
+    reported as a conflict to retry.
+    """
+    try:
+        await lock_host(db)
+        yield
+    except OperationalError as error:
+        await db.rollback()
+        if not is_lock_conflict(error):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another booking is being made at the same time; please retry"
+        )
+    except BaseException:
+        # Release the lock now rather than when the session is closed
+        await db.rollback()
+        raise
+
+async def _get_cached_slots(
+    event_type: EventTypeSchema,
+    start_date: date,
+    end_date: date,
+    timezone: str
+) -> Dict[date, List[datetime]]:
+    """
+    Serve each day from the slot cache and compute the missing days in one
+    pass, on a session of its own; callers shouldn't hold a connection while
+    they wait.
+    """
+    event_type_id = event_type.id
+    generation = slot_cache.generation(event_type_id)
+    days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
     
-    db.add(db_meeting)
-    db.commit()
-    db.refresh(db_meeting)
+    cached = {}
+    missing = []
+    for day in days:
+        slots = slot_cache.get(event_type_id, day, timezone)
+        if slots is None:
+            missing.append(day)
+        else:
+            cached[day] = slots
     
-    return db_meeting
+    if missing:
+        async def compute() -> Dict[date, List[datetime]]:
+            # Shared by every request waiting on this flight, so it can't use
+            # the session of the request that happened to start it
+            async with ReadSessionLocal() as flight_db:
+                replica_read_at = time.monotonic() if reads_replica(flight_db) else None
+                computed = await get_available_time_slots_for_range(
+                    flight_db, event_type_id, missing[0], missing[-1], timezone, event_type=event_type
+                )
+            for day in missing:
+                slot_cache.set(event_type_id, day, timezone, computed.get(day, []), generation, replica_read_at)
+            return computed
+        
+        # Identical requests arriving together (a shared booking link going
+        # around) share one computation. The generation is part of the key so
+        # a request made after a booking never joins a computation from before it.
+        computed = await slot_flights.do(
+            (event_type_id, missing[0], missing[-1], timezone, generation), compute
+        )
+        for day in missing:
+            cached[day] = computed.get(day, [])
+    
+    return {day: cached[day] for day in days}
@@ -1,76 +1,160 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
 from typing import List
-from database.database import get_db
+import pytz
+from database.database import get_db, get_read_db
 from app.models.event_type import EventType
+from app.models.meeting import Meeting
 from app.schemas.event_type import EventType as EventTypeSchema, EventTypeCreate, EventTypeUpdate
+from app.responses import FastJSONResponse
+from app.services.booking_service import BUSY_STATUSES, _to_utc
+from app.services.event_type_cache import event_type_cache
+from app.services.http_cache import REVALIDATE, etag_matches, event_type_etag, http_date, is_not_modified
+from app.services.ical import feed_version, stream_calendar
+from app.services.schedule_cache import _merge_intervals, schedule_cache
+from app.services.slot_cache import meeting_dates, slot_cache
+from app.services.slot_events import SLOT_FREED, slot_events
 
 router = APIRouter()
 
+# Columns of the EventType schema, so lists can be returned without building ORM objects
+EVENT_TYPE_COLUMNS = [getattr(EventType, field) for field in EventTypeSchema.model_fields]
+
 @router.get("/", response_model=List[EventTypeSchema])
-def get_event_types(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_event_types(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_read_db)):
     """Get all event types"""
-    event_types = db.query(EventType).offset(skip).limit(limit).all()
-    return event_types
+    event_types = (await db.execute(select(*EVENT_TYPE_COLUMNS).offset(skip).limit(limit))).mappings().all()
+    return FastJSONResponse([dict(event_type) for event_type in event_types])
 
 @router.get("/{event_type_id}", response_model=EventTypeSchema)
-def get_event_type(event_type_id: int, db: Session = Depends(get_db)):
+async def get_event_type(event_type_id: int, db: AsyncSession = Depends(get_read_db)):
     """Get a specific event type by ID"""
-    event_type = db.query(EventType).filter(EventType.id == event_type_id).first()
+    event_type = await event_type_cache.get_by_id(db, event_type_id)
     if not event_type:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
     return event_type
 
 @router.get("/slug/{slug}", response_model=EventTypeSchema)
-def get_event_type_by_slug(slug: str, db: Session = Depends(get_db)):
-    """Get a specific event type by slug"""
-    event_type = db.query(EventType).filter(EventType.slug == slug).first()
-    if not event_type:
+async def get_event_type_by_slug(slug: str, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    """
+    Get a specific event type by slug.
+    The ETag comes from the revisions in the database rather than the event
+    type cache, which other workers may have changed behind this one's back;
+    a matching If-None-Match is answered with 304 after reading just those.
+    """
+    version = (await db.execute(
+        select(EventType.id, EventType.revision, EventType.availability_revision).where(EventType.slug == slug)
+    )).first()
+    if version is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
+    
+    headers = {"ETag": event_type_etag(version), "Cache-Control": REVALIDATE}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    event_type = await event_type_cache.get_by_slug(db, slug)
+    if event_type is None or event_type_etag(event_type) != headers["ETag"]:
+        # The cached copy predates a change made through another worker
+        event_type_cache.invalidate(version.id)
+        event_type = await event_type_cache.get_by_id(db, version.id)
+        if not event_type:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
+        headers["ETag"] = event_type_etag(event_type)
+    response.headers.update(headers)
     return event_type
 
+@router.get("/{event_type_id}/calendar.ics")
+async def get_event_type_calendar(event_type_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    """
+    Get the meetings of an event type as an iCalendar feed.
+    Supports conditional GET: unchanged feeds return 304 without reading any meetings.
+    """
+    event_type = await event_type_cache.get_by_id(db, event_type_id)
+    if not event_type:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
+
+    etag, last_modified = await feed_version(db, event_type)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": "no-cache",
+    }
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{event_type.slug}.ics"'
+    return StreamingResponse(stream_calendar(event_type), media_type="text/calendar; charset=utf-8", headers=headers)
+
 @router.post("/", response_model=EventTypeSchema, status_code=status.HTTP_201_CREATED)
-def create_event_type(event_type: EventTypeCreate, db: Session = Depends(get_db)):
+async def create_event_type(event_type: EventTypeCreate, db: AsyncSession = Depends(get_db)):
     """Create a new event type"""
     # Check if slug already exists
-    existing = db.query(EventType).filter(EventType.slug == event_type.slug).first()
+    existing = await db.scalar(select(EventType).where(EventType.slug == event_type.slug))
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug already exists")
     
     db_event_type = EventType(**event_type.model_dump())
     db.add(db_event_type)
-    db.commit()
-    db.refresh(db_event_type)
+    await db.commit()
+    await db.refresh(db_event_type)
     return db_event_type
 
 @router.put("/{event_type_id}", response_model=EventTypeSchema)
-def update_event_type(event_type_id: int, event_type: EventTypeUpdate, db: Session = Depends(get_db)):
+async def update_event_type(event_type_id: int, event_type: EventTypeUpdate, db: AsyncSession = Depends(get_db)):
     """Update an event type"""
-    db_event_type = db.query(EventType).filter(EventType.id == event_type_id).first()
+    db_event_type = await db.get(EventType, event_type_id)
     if not db_event_type:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
     
     # Check if new slug conflicts with existing
     if event_type.slug and event_type.slug != db_event_type.slug:
-        existing = db.query(EventType).filter(EventType.slug == event_type.slug).first()
+        existing = await db.scalar(select(EventType).where(EventType.slug == event_type.slug))
         if existing:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Slug already exists")
     
     update_data = event_type.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_event_type, field, value)
+    db_event_type.revision = EventType.revision + 1
     
-    db.commit()
-    db.refresh(db_event_type)
+    await db.commit()
+    await db.refresh(db_event_type)
+    event_type_cache.invalidate(event_type_id)
+    slot_cache.invalidate_event_type(event_type_id)
+    # A new duration changes every slot of the event type
+    slot_events.publish_resync(event_type_id)
     return db_event_type
 
 @router.delete("/{event_type_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_event_type(event_type_id: int, db: Session = Depends(get_db)):
+async def delete_event_type(event_type_id: int, db: AsyncSession = Depends(get_db)):
     """Delete an event type"""
-    db_event_type = db.query(EventType).filter(EventType.id == event_type_id).first()
+    db_event_type = await db.get(EventType, event_type_id)
     if not db_event_type:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event type not found")
     
-    db.delete(db_event_type)
-    db.commit()
+    # Its meetings are deleted with it, which frees their time for every other event type
+    busy = _merge_intervals(
+        (_to_utc(scheduled_at), _to_utc(ends_at))
+        for scheduled_at, ends_at in await db.execute(select(Meeting.scheduled_at, Meeting.ends_at).where(
+            Meeting.event_type_id == event_type_id,
+            Meeting.status.in_(BUSY_STATUSES)
+        ))
+    )
+    
+    await db.delete(db_event_type)
+    await db.commit()
+    event_type_cache.invalidate(event_type_id)
+    schedule_cache.invalidate(event_type_id)
+    slot_cache.invalidate_event_type(event_type_id)
+    slot_cache.invalidate_dates({day for start, end in busy for day in meeting_dates(start, end)})
+    # Its own booking pages refetch and find it gone
+    slot_events.publish_resync(event_type_id)
+    # Booking pages only show what's ahead, so past meetings need no event
+    now = datetime.now(pytz.UTC)
+    for start, end in busy:
+        if end > now:
+            slot_events.publish_busy_change(SLOT_FREED, start, end)
     return None
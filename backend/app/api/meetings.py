@@ -1,83 +1,225 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from datetime import datetime
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, select
+from sqlalchemy.sql import Select
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
 import pytz
-from database.database import get_db
+from database.database import get_db, get_read_db
+from app.models.archived_meeting import ArchivedMeeting
 from app.models.meeting import Meeting, MeetingStatus
-from app.schemas.meeting import Meeting as MeetingSchema, MeetingUpdate
+from app.responses import FastJSONResponse
+from app.schemas.meeting import Meeting as MeetingSchema, MeetingPage, MeetingUpdate
+from app.services.booking_rollups import apply_changes, status_change
+from app.services.meeting_export import combine_tiers, export_query, stream_meetings
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.slot_cache import slot_cache
+from app.services.slot_events import SLOT_FREED, slot_events
 
 router = APIRouter()
 
-@router.get("/", response_model=List[MeetingSchema])
-def get_meetings(
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Columns of the Meeting schema, so list rows can be returned without building ORM objects
+MEETING_COLUMNS = [getattr(Meeting, field) for field in MeetingSchema.model_fields]
+ARCHIVED_MEETING_COLUMNS = [getattr(ArchivedMeeting, field) for field in MeetingSchema.model_fields]
+
+# A meeting tier (Meeting or ArchivedMeeting) and a query selecting its schema columns
+Tier = Tuple[type, Select]
+
+@router.get("/", response_model=MeetingPage)
+async def get_meetings(
     status_filter: Optional[str] = None,
     upcoming_only: bool = False,
     past_only: bool = False,
-    db: Session = Depends(get_db)
+    event_type_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all meetings with optional filtering"""
-    query = db.query(Meeting)
-    
+    """Get a page of meetings with optional filtering, newest first, archived meetings included"""
     now = datetime.now(pytz.UTC)
+    meeting_status = _parse_status(status_filter) if status_filter else None
     
-    if upcoming_only:
-        query = query.filter(Meeting.scheduled_at >= now)
-    elif past_only:
-        query = query.filter(Meeting.scheduled_at < now)
-    
-    if status_filter:
-        try:
-            status_enum = MeetingStatus[status_filter.upper()]
-            query = query.filter(Meeting.status == status_enum)
-        except KeyError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status: {status_filter}. Must be one of: scheduled, cancelled, completed"
-            )
+    tiers: List[Tier] = []
+    # Archived meetings all ended long ago
+    for model, columns in ((Meeting, MEETING_COLUMNS), (ArchivedMeeting, ARCHIVED_MEETING_COLUMNS)):
+        if upcoming_only and model is ArchivedMeeting:
+            continue
+        query = select(*columns)
+        if upcoming_only:
+            query = query.where(model.scheduled_at >= now)
+        elif past_only:
+            query = query.where(model.scheduled_at < now)
+        if meeting_status:
+            query = query.where(model.status == meeting_status)
+        tiers.append((model, query))
     
-    meetings = query.order_by(Meeting.scheduled_at.desc()).all()
-    return meetings
+    return await _get_page(db, tiers, event_type_id, cursor, limit, descending=True)
 
-@router.get("/upcoming", response_model=List[MeetingSchema])
-def get_upcoming_meetings(db: Session = Depends(get_db)):
-    """Get all upcoming meetings"""
+@router.get("/upcoming", response_model=MeetingPage)
+async def get_upcoming_meetings(
+    event_type_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a page of upcoming meetings, soonest first"""
     now = datetime.now(pytz.UTC)
-    meetings = db.query(Meeting).filter(
+    query = select(*MEETING_COLUMNS).where(
         Meeting.scheduled_at >= now,
         Meeting.status == MeetingStatus.SCHEDULED
-    ).order_by(Meeting.scheduled_at.asc()).all()
-    return meetings
+    )
+    return await _get_page(db, [(Meeting, query)], event_type_id, cursor, limit, descending=False)
 
-@router.get("/past", response_model=List[MeetingSchema])
-def get_past_meetings(db: Session = Depends(get_db)):
-    """Get all past meetings"""
+@router.get("/past", response_model=MeetingPage)
+async def get_past_meetings(
+    event_type_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get a page of past meetings, most recent first, archived meetings included"""
     now = datetime.now(pytz.UTC)
-    meetings = db.query(Meeting).filter(
-        Meeting.scheduled_at < now
-    ).order_by(Meeting.scheduled_at.desc()).all()
-    return meetings
+    tiers: List[Tier] = [
+        (Meeting, select(*MEETING_COLUMNS).where(Meeting.scheduled_at < now)),
+        (ArchivedMeeting, select(*ARCHIVED_MEETING_COLUMNS).where(ArchivedMeeting.scheduled_at < now)),
+    ]
+    return await _get_page(db, tiers, event_type_id, cursor, limit, descending=True)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@router.get("/export")
+async def export_meetings(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status_filter: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    event_type_id: Optional[int] = None
+):
+    """
+    Stream meetings as NDJSON or CSV, optionally filtered by status, date range and event type.
+    Archived meetings are included.
+    """
+    meeting_status = _parse_status(status_filter) if status_filter else None
+    
+    queries = []
+    for model in (Meeting, ArchivedMeeting):
+        query = export_query(model)
+        if meeting_status:
+            query = query.where(model.status == meeting_status)
+        if start_date:
+            query = query.where(model.scheduled_at >= datetime.combine(start_date, time.min).replace(tzinfo=pytz.UTC))
+        if end_date:
+            query = query.where(
+                model.scheduled_at < datetime.combine(end_date + timedelta(days=1), time.min).replace(tzinfo=pytz.UTC)
+            )
+        if event_type_id is not None:
+            query = query.where(model.event_type_id == event_type_id)
+        queries.append(query)
+    
+    return StreamingResponse(
+        stream_meetings(combine_tiers(queries), format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="meetings.{format}"'}
+    )
 
 @router.get("/{meeting_id}", response_model=MeetingSchema)
-def get_meeting(meeting_id: int, db: Session = Depends(get_db)):
-    """Get a specific meeting by ID"""
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+async def get_meeting(meeting_id: int, db: AsyncSession = Depends(get_read_db)):
+    """Get a specific meeting by ID, archived or not"""
+    meeting = await db.get(Meeting, meeting_id) or await db.get(ArchivedMeeting, meeting_id)
     if not meeting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
     return meeting
 
 @router.put("/{meeting_id}/cancel", response_model=MeetingSchema)
-def cancel_meeting(meeting_id: int, db: Session = Depends(get_db)):
+async def cancel_meeting(meeting_id: int, db: AsyncSession = Depends(get_db)):
     """Cancel a meeting"""
-    meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+    # Lock the row so concurrent cancellations count the status change once
+    meeting = await db.get(Meeting, meeting_id, with_for_update=True)
     if not meeting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
     
     if meeting.status == MeetingStatus.CANCELLED:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Meeting is already cancelled")
     
+    await apply_changes(db, status_change(
+        meeting.event_type_id, meeting.scheduled_at, meeting.status, MeetingStatus.CANCELLED
+    ))
     meeting.status = MeetingStatus.CANCELLED
-    db.commit()
-    db.refresh(meeting)
+    await db.commit()
+    await db.refresh(meeting)
+    
+    # The freed time shows up again for every event type
+    slot_cache.invalidate_meeting(meeting.scheduled_at, meeting.ends_at)
+    slot_events.publish_busy_change(SLOT_FREED, meeting.scheduled_at, meeting.ends_at)
     return meeting
+
+async def _get_page(
+    db: AsyncSession,
+    tiers: List[Tier],
+    event_type_id: Optional[int],
+    cursor: Optional[str],
+    limit: int,
+    descending: bool
+) -> FastJSONResponse:
+    """
+    Fetch one page of a meetings query using (scheduled_at, id) keyset pagination.
+    The cursor is the position of the last row of the previous page, so each
+    page is an index range scan no matter how deep into the list it is.
+    With both tiers, each is paged on its own index and the two pages are
+    merged; ids are unique across tiers, so the cursor works on the merge.
+    The queries select the Meeting schema columns; the rows are encoded as
+    they come, without ORM objects or per-row schema validation.
+    """
+    if cursor:
+        try:
+            after_scheduled_at, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    meetings = []
+    for model, query in tiers:
+        if event_type_id is not None:
+            query = query.where(model.event_type_id == event_type_id)
+        
+        if cursor:
+            if descending:
+                query = query.where(or_(
+                    model.scheduled_at < after_scheduled_at,
+                    and_(model.scheduled_at == after_scheduled_at, model.id < after_id)
+                ))
+            else:
+                query = query.where(or_(
+                    model.scheduled_at > after_scheduled_at,
+                    and_(model.scheduled_at == after_scheduled_at, model.id > after_id)
+                ))
+        
+        if descending:
+            query = query.order_by(model.scheduled_at.desc(), model.id.desc())
+        else:
+            query = query.order_by(model.scheduled_at.asc(), model.id.asc())
+        
+        # Fetch one extra row to know whether there is a next page
+        meetings += (await db.execute(query.limit(limit + 1))).mappings().all()
+    
+    if len(tiers) > 1:
+        meetings.sort(key=lambda meeting: (meeting["scheduled_at"], meeting["id"]), reverse=descending)
+    
+    next_cursor = None
+    if len(meetings) > limit:
+        meetings = meetings[:limit]
+        next_cursor = encode_cursor(meetings[-1]["scheduled_at"], meetings[-1]["id"])
+    
+    return FastJSONResponse({"items": [dict(meeting) for meeting in meetings], "next_cursor": next_cursor})
+
+def _parse_status(status_filter: str) -> MeetingStatus:
+    try:
+        return MeetingStatus[status_filter.upper()]
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status: {status_filter}. Must be one of: scheduled, cancelled, completed"
+        )
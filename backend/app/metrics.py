@@ -0,0 +1,215 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds of the histogram buckets, as in the Prometheus client defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+# Route label of requests that didn't match any route, to keep the label set bounded
+UNMATCHED_ROUTE = "unmatched"
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, rendered in the Prometheus text format"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{_format_number(bound)}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {_format_number(self.sum)}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+class RequestStats:
+    """Database work done while serving one request"""
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+# Stats of the request being served; SQLAlchemy runs the driver calls of the
+# async engines in greenlets that share the caller's context, so the cursor
+# hooks see the request that issued the query
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+class MetricsRegistry:
+    """
+    Per-route request latency, SQL statement count and database time.
+
+    Routes are labelled with their path template (e.g. /api/meetings/{meeting_id}),
+    never the raw path, so the number of series stays bounded. The metrics are
+    per process: each worker exposes its own and Prometheus sums them up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        self._queries: Dict[Tuple[str, str], Histogram] = {}
+        self._db_time: Dict[Tuple[str, str], Histogram] = {}
+        self.queries_total = 0
+        self.db_seconds_total = 0.0
+
+    def observe_request(self, method: str, route: str, status_code: int, seconds: float, stats: RequestStats) -> None:
+        key = (method, route)
+        with self._lock:
+            self._requests[(method, route, status_code)] = self._requests.get((method, route, status_code), 0) + 1
+            self._histogram(self._latency, key, LATENCY_BUCKETS).observe(seconds)
+            self._histogram(self._queries, key, QUERY_COUNT_BUCKETS).observe(stats.queries)
+            self._histogram(self._db_time, key, LATENCY_BUCKETS).observe(stats.db_seconds)
+
+    def observe_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries_total += 1
+            self.db_seconds_total += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._latency.clear()
+            self._queries.clear()
+            self._db_time.clear()
+            self.queries_total = 0
+            self.db_seconds_total = 0.0
+
+    def render(
+        self,
+        cache_stats: Optional[Dict[str, Dict[str, int]]] = None,
+        extra: Iterable[Tuple[str, str, str, float]] = ()
+    ) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+        extra holds (name, type, help, value) of unlabelled metrics kept by
+        other components, like the number of open event streams.
+        """
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_total Requests served, by route and status code.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status_code), count in sorted(self._requests.items()):
+                lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status_code)}}} {count}")
+
+            for name, help_text, histograms in (
+                ("http_request_duration_seconds", "Time to serve a request, including streaming the body.", self._latency),
+                ("http_request_db_queries", "SQL statements executed per request.", self._queries),
+                ("http_request_db_seconds", "Time spent in the database per request.", self._db_time),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(histograms.items()):
+                    lines += histogram.render(name, _labels(method=method, route=route))
+
+            lines += [
+                "# HELP db_queries_total SQL statements executed, in and out of requests.",
+                "# TYPE db_queries_total counter",
+                f"db_queries_total {self.queries_total}",
+                "# HELP db_query_seconds_total Time spent executing SQL statements.",
+                "# TYPE db_query_seconds_total counter",
+                f"db_query_seconds_total {_format_number(self.db_seconds_total)}",
+            ]
+
+        if cache_stats:
+            for stat, kind in (
+                ("hits", "counter"),
+                ("misses", "counter"),
+                ("evictions", "counter"),
+                ("invalidations", "counter"),
+                ("size", "gauge"),
+            ):
+                name = f"cache_{stat}_total" if kind == "counter" else f"cache_{stat}"
+                lines += [f"# HELP {name} In-process cache {stat}.", f"# TYPE {name} {kind}"]
+                for cache, stats in sorted(cache_stats.items()):
+                    if stat in stats:
+                        lines.append(f"{name}{{{_labels(cache=cache)}}} {stats[stat]}")
+
+        for name, kind, help_text, value in extra:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_format_number(value)}"]
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram(histograms: Dict[Tuple[str, str], Histogram], key: Tuple[str, str], buckets) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(buckets)
+        return histogram
+
+metrics = MetricsRegistry()
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency and database work of every request.
+    Written as plain ASGI rather than BaseHTTPMiddleware so streamed responses
+    are timed until their last chunk and their queries are counted.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_stats.reset(token)
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            self.registry.observe_request(scope["method"], route, status_code, time.perf_counter() - started, stats)
+
+def instrument_engine(engine: Engine, registry: MetricsRegistry = metrics) -> None:
+    """Count the statements an engine executes and the time they take; pass sync_engine for async engines"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        registry.observe_query(elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+def _labels(**labels) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -1,5 +1,8 @@
 from .event_type import EventType
 from .availability import AvailabilitySchedule
 from .meeting import Meeting, MeetingStatus
+from .archived_meeting import ArchivedMeeting
+from .booking_rollup import BookingRollup
+from .host_lock import HostLock
 
-__all__ = ["EventType", "AvailabilitySchedule", "Meeting", "MeetingStatus"]
+__all__ = ["EventType", "AvailabilitySchedule", "Meeting", "MeetingStatus", "ArchivedMeeting", "BookingRollup", "HostLock"]
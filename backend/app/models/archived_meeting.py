@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from database.database import Base
+from app.models.meeting import MeetingStatus
+
+class ArchivedMeeting(Base):
+    """
+    Cold tier of the meetings: completed and cancelled meetings that ended
+    before the archive horizon, moved here by the archival job.
+
+    Rows keep the id and every column of the meeting they were moved from, so
+    the past meetings list and the export read both tables as one. Meeting ids
+    are never reused (MySQL 8.0 persists its AUTO_INCREMENT counter, and the
+    meetings table uses AUTOINCREMENT on SQLite), so an id can't be archived
+    twice. Nothing here is ever scheduled, so booking and slot generation
+    never look at it.
+    """
+    __tablename__ = "archived_meetings"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # Id the meeting had in the meetings table
+    event_type_id = Column(Integer, ForeignKey("event_types.id", ondelete="CASCADE"), nullable=False)
+    invitee_name = Column(String(255), nullable=False)
+    invitee_email = Column(String(255), nullable=False)
+    scheduled_at = Column(DateTime(timezone=True), nullable=False)
+    ends_at = Column(DateTime(timezone=True), nullable=False)
+    status = Column(Enum(MeetingStatus), nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    event_type = relationship("EventType", back_populates="archived_meetings")
+
+    __table_args__ = (
+        # Keyset pagination of the past meetings, overall and per event type
+        Index("ix_archived_meetings_scheduled", "scheduled_at", "id"),
+        Index("ix_archived_meetings_event_type_scheduled", "event_type_id", "scheduled_at", "id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Time, ForeignKey
+from sqlalchemy import Column, Integer, String, Time, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database.database import Base
 
@@ -14,3 +14,7 @@ class AvailabilitySchedule(Base):
 
     # Relationships
     event_type = relationship("EventType", back_populates="availability_schedules")
+
+    __table_args__ = (
+        Index("ix_availability_event_type_day", "event_type_id", "day_of_week"),
+    )
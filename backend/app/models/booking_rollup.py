@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Date, Enum, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from database.database import Base
+from app.models.meeting import MeetingStatus
+
+class BookingRollup(Base):
+    """
+    Number of meetings of an event type on one day (UTC) in one status.
+
+    Kept up to date by every write that adds a meeting or changes its status,
+    in the same transaction, so analytics read a row per day instead of every
+    meeting. Archiving a meeting doesn't change its row.
+    """
+    __tablename__ = "booking_daily_rollups"
+
+    event_type_id = Column(Integer, ForeignKey("event_types.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)  # UTC date of scheduled_at
+    status = Column(Enum(MeetingStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    # Relationships
+    event_type = relationship("EventType", back_populates="booking_rollups")
+
+    __table_args__ = (
+        # Date range queries across every event type
+        Index("ix_booking_daily_rollups_date", "date"),
+    )
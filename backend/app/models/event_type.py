@@ -12,7 +12,14 @@ class EventType(Base):
     slug = Column(String(255), unique=True, nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    revision = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped by every update of the event type
+    availability_revision = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped by every availability write
 
     # Relationships
     availability_schedules = relationship("AvailabilitySchedule", back_populates="event_type", cascade="all, delete-orphan")
     meetings = relationship("Meeting", back_populates="event_type", cascade="all, delete-orphan")
+    # The archive is never loaded to delete it; the foreign key's ON DELETE CASCADE does that
+    archived_meetings = relationship(
+        "ArchivedMeeting", back_populates="event_type", cascade="all, delete-orphan", passive_deletes=True
+    )
+    booking_rollups = relationship("BookingRollup", back_populates="event_type", cascade="all, delete-orphan")
@@ -0,0 +1,23 @@
+from sqlalchemy import DDL, Column, DateTime, Integer, event
+from database.database import Base
+
+# Id of the one row of host_locks; every event type belongs to the same host
+HOST_LOCK_ID = 1
+
+class HostLock(Base):
+    """
+    Row that every booking transaction locks before it checks availability.
+
+    A meeting of any event type blocks the others, so two bookings must not
+    decide on the host's busy time at the same time. Locking this one row
+    first makes them take turns, without the range locks over the meetings
+    a locking read of the busy time would take, and every booking takes the
+    same lock first, so bookings can't deadlock on each other.
+    """
+    __tablename__ = "host_locks"
+
+    id = Column(Integer, primary_key=True)
+    locked_at = Column(DateTime(timezone=True))  # When a booking last took the lock
+
+# The row is created with the table, so every way of creating the schema has it
+event.listen(HostLock.__table__, "after_create", DDL(f"INSERT INTO host_locks (id) VALUES ({HOST_LOCK_ID})"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -17,9 +17,23 @@ class Meeting(Base):
     invitee_name = Column(String(255), nullable=False)
     invitee_email = Column(String(255), nullable=False)
     scheduled_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    ends_at = Column(DateTime(timezone=True), nullable=False)  # scheduled_at + duration at booking time
     status = Column(Enum(MeetingStatus), default=MeetingStatus.SCHEDULED, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     event_type = relationship("EventType", back_populates="meetings")
+
+    __table_args__ = (
+        # Keyset pagination of the meeting lists filtered by event type
+        Index("ix_meetings_event_type_scheduled", "event_type_id", "scheduled_at", "id"),
+        # Busy time of the host across every event type, and the scheduled
+        # meetings that have ended, for the completion job. ends_at leads the
+        # range part so a lookup starts at the window and only walks the
+        # meetings after it, however long the history is.
+        Index("ix_meetings_status_window", "status", "ends_at", "scheduled_at"),
+        # Archived meetings keep their id, so SQLite must never hand it out
+        # again once the meeting has left this table
+        {"sqlite_autoincrement": True},
+    )
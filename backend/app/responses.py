@@ -0,0 +1,16 @@
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    JSON response encoded with orjson, for routes that return plain rows.
+
+    Routes returning it skip response_model validation, so the content must
+    already have the shape of the documented schema. Datetimes, dates and
+    enums are encoded the way the Pydantic schemas encode them; aware UTC
+    datetimes end in Z.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
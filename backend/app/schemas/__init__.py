@@ -1,9 +1,11 @@
 from .event_type import EventType, EventTypeCreate, EventTypeUpdate
-from .availability import AvailabilitySchedule, AvailabilityScheduleCreate, AvailabilityScheduleUpdate
-from .meeting import Meeting, MeetingCreate, MeetingUpdate
+from .availability import AvailabilitySchedule, AvailabilityScheduleCreate, AvailabilityScheduleItem, AvailabilityScheduleUpdate
+from .meeting import BulkBookingReport, BulkBookingResult, Meeting, MeetingCreate, MeetingPage, MeetingUpdate
+from .analytics import BookingAnalytics, BookingCounts, DailyBookingStats, EventTypeBookingStats
 
 __all__ = [
     "EventType", "EventTypeCreate", "EventTypeUpdate",
-    "AvailabilitySchedule", "AvailabilityScheduleCreate", "AvailabilityScheduleUpdate",
-    "Meeting", "MeetingCreate", "MeetingUpdate"
+    "AvailabilitySchedule", "AvailabilityScheduleCreate", "AvailabilityScheduleItem", "AvailabilityScheduleUpdate",
+    "BulkBookingReport", "BulkBookingResult", "Meeting", "MeetingCreate", "MeetingPage", "MeetingUpdate",
+    "BookingAnalytics", "BookingCounts", "DailyBookingStats", "EventTypeBookingStats"
 ]
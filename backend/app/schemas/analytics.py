@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+class BookingCounts(BaseModel):
+    scheduled: int = 0
+    completed: int = 0
+    cancelled: int = 0
+    total: int = 0
+    cancellation_rate: float = 0.0  # cancelled / total, 0 when there are no meetings
+
+class EventTypeBookingStats(BookingCounts):
+    event_type_id: int
+
+class DailyBookingStats(BookingCounts):
+    date: date  # UTC date of the meetings
+
+class BookingAnalytics(BaseModel):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    totals: BookingCounts
+    event_types: List[EventTypeBookingStats]
+    days: List[DailyBookingStats]  # Every day with meetings, in date order
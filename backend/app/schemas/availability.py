@@ -12,6 +12,13 @@ class AvailabilityScheduleBase(BaseModel):
 class AvailabilityScheduleCreate(AvailabilityScheduleBase):
     pass
 
+class AvailabilityScheduleItem(BaseModel):
+    """One entry of a weekly schedule replaced as a whole"""
+    day_of_week: int  # 0-6, Monday=0
+    start_time: time
+    end_time: time
+    timezone: str = "UTC"
+
 class AvailabilityScheduleUpdate(BaseModel):
     day_of_week: Optional[int] = None
     start_time: Optional[time] = None
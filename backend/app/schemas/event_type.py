@@ -19,5 +19,7 @@ class EventType(EventTypeBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    revision: int = 0  # Changes whenever the event type is updated
+    availability_revision: int = 0  # Changes whenever the availability schedules change
 
     model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.models.meeting import MeetingStatus
 
 class MeetingBase(BaseModel):
@@ -10,15 +10,31 @@ class MeetingBase(BaseModel):
     scheduled_at: datetime
 
 class MeetingCreate(MeetingBase):
-    pass
+    timezone: str = "UTC"  # Timezone the slot was offered in
 
 class Meeting(MeetingBase):
     id: int
+    ends_at: datetime
     status: MeetingStatus
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
+class MeetingPage(BaseModel):
+    items: List[Meeting]
+    next_cursor: Optional[str] = None  # Pass back as cursor to get the next page
+
+class BulkBookingResult(BaseModel):
+    index: int  # Position of the row in the request
+    accepted: bool
+    meeting_id: Optional[int] = None
+    reason: Optional[str] = None  # Why the row was rejected
+
+class BulkBookingReport(BaseModel):
+    accepted: int
+    rejected: int
+    results: List[BulkBookingResult]
+
 class MeetingUpdate(BaseModel):
     status: Optional[MeetingStatus] = None
@@ -0,0 +1,101 @@
+from collections import Counter
+from datetime import date, datetime
+from typing import Tuple
+from sqlalchemy import delete, func, insert, select, union_all, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.archived_meeting import ArchivedMeeting
+from app.models.booking_rollup import BookingRollup
+from app.models.meeting import Meeting, MeetingStatus
+from app.services.booking_service import _to_utc
+
+# (event_type_id, date, status)
+RollupKey = Tuple[int, date, MeetingStatus]
+
+def rollup_key(event_type_id: int, scheduled_at: datetime, status: MeetingStatus) -> RollupKey:
+    """Key of the rollup row a meeting is counted in"""
+    return event_type_id, _to_utc(scheduled_at).date(), status
+
+def status_change(event_type_id: int, scheduled_at: datetime, old: MeetingStatus, new: MeetingStatus) -> Counter:
+    """Rollup changes of one meeting moving from one status to another"""
+    changes = Counter()
+    changes[rollup_key(event_type_id, scheduled_at, old)] -= 1
+    changes[rollup_key(event_type_id, scheduled_at, new)] += 1
+    return changes
+
+async def apply_changes(db: AsyncSession, changes: Counter) -> None:
+    """
+    Add the counts in changes to their rollup rows, in the caller's transaction.
+
+    The rows are upserted with the database's own statement where it has one
+    (ON CONFLICT on SQLite and PostgreSQL, ON DUPLICATE KEY on MySQL), so
+    concurrent writes to the same day add up instead of racing to insert the
+    row. Other databases update each row and insert the ones that don't exist.
+    """
+    rows = [
+        {"event_type_id": event_type_id, "date": day, "status": status, "count": count}
+        for (event_type_id, day, status), count in changes.items()
+        if count
+    ]
+    if not rows:
+        return
+
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        statement = mysql.insert(BookingRollup)
+        statement = statement.on_duplicate_key_update(count=BookingRollup.count + statement.inserted["count"])
+    elif dialect in ("sqlite", "postgresql"):
+        statement = (sqlite if dialect == "sqlite" else postgresql).insert(BookingRollup)
+        statement = statement.on_conflict_do_update(
+            index_elements=[BookingRollup.event_type_id, BookingRollup.date, BookingRollup.status],
+            set_={"count": BookingRollup.count + statement.excluded["count"]}
+        )
+    else:
+        for row in rows:
+            await _update_or_insert(db, row)
+        return
+    await db.execute(statement, rows)
+
+async def _update_or_insert(db: AsyncSession, row: dict) -> None:
+    """Add to one rollup row, creating it if it doesn't exist, without a dialect-specific upsert"""
+    key = (
+        BookingRollup.event_type_id == row["event_type_id"],
+        BookingRollup.date == row["date"],
+        BookingRollup.status == row["status"],
+    )
+    while True:
+        result = await db.execute(
+            update(BookingRollup).where(*key).values(count=BookingRollup.count + row["count"])
+        )
+        if result.rowcount:
+            return
+        try:
+            # In a savepoint, so losing the race to insert the row keeps the caller's transaction
+            async with db.begin_nested():
+                await db.execute(insert(BookingRollup).values(**row))
+            return
+        except IntegrityError:
+            # Inserted concurrently since the update; add to it instead
+            continue
+
+def rebuild(connection: Connection) -> int:
+    """
+    Recompute every rollup row from the meetings and archived meetings.
+    Used to backfill the table and to repair it after writes that bypass the
+    API; the caller commits. Returns the number of rows written.
+    """
+    meetings = union_all(*(
+        select(model.event_type_id, func.date(model.scheduled_at).label("date"), model.status)
+        for model in (Meeting, ArchivedMeeting)
+    )).subquery()
+    counts = select(
+        meetings.c.event_type_id, meetings.c.date, meetings.c.status, func.count().label("count")
+    ).group_by(meetings.c.event_type_id, meetings.c.date, meetings.c.status)
+
+    connection.execute(delete(BookingRollup))
+    result = connection.execute(
+        insert(BookingRollup).from_select(["event_type_id", "date", "status", "count"], counts)
+    )
+    return result.rowcount
@@ -1,137 +1,203 @@
-from sqlalchemy.orm import Session
-from datetime import datetime, date, time, timedelta
-from typing import List, Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Tuple
 import pytz
-from app.models.event_type import EventType
-from app.models.availability import AvailabilitySchedule
+from app.models.host_lock import HOST_LOCK_ID, HostLock
 from app.models.meeting import Meeting, MeetingStatus
+from app.schemas.event_type import EventType as EventTypeSchema
+from app.services.event_type_cache import event_type_cache
+from app.services.schedule_cache import Interval, _merge_intervals, schedule_cache
 
-def get_available_time_slots(
-    db: Session,
+# Meetings that keep the host busy; completing a meeting that ended doesn't
+# free its time, so past slots stay taken once the completion job has run
+BUSY_STATUSES = (MeetingStatus.SCHEDULED, MeetingStatus.COMPLETED)
+
+async def get_available_time_slots(
+    db: AsyncSession,
     event_type_id: int,
     selected_date: date,
-    timezone: str = "UTC"
+    timezone: str = "UTC",
+    event_type: Optional[EventTypeSchema] = None
 ) -> List[datetime]:
     """
     Calculate available time slots for a given event type and date.
+    Pass event_type if the caller already loaded it, to skip the lookup.
     Returns list of datetime objects in UTC.
     """
     # Get event type
-    event_type = db.query(EventType).filter(EventType.id == event_type_id).first()
+    if event_type is None:
+        event_type = await event_type_cache.get_by_id(db, event_type_id)
     if not event_type:
         return []
-    
-    # Get day of week (0=Monday, 6=Sunday)
-    day_of_week = selected_date.weekday()
-    
-    # Get availability schedules for this day of week
-    schedules = db.query(AvailabilitySchedule).filter(
-        AvailabilitySchedule.event_type_id == event_type_id,
-        AvailabilitySchedule.day_of_week == day_of_week
-    ).all()
-    
-    if not schedules:
-        return []
-    
-    # Get all existing meetings for this event type on this date
-    start_of_day = datetime.combine(selected_date, time.min).replace(tzinfo=pytz.UTC)
-    end_of_day = datetime.combine(selected_date, time.max).replace(tzinfo=pytz.UTC)
-    
-    existing_meetings = db.query(Meeting).filter(
-        Meeting.event_type_id == event_type_id,
-        Meeting.status == MeetingStatus.SCHEDULED,
-        Meeting.scheduled_at >= start_of_day,
-        Meeting.scheduled_at <= end_of_day
-    ).all()
-    
-    booked_times = {meeting.scheduled_at for meeting in existing_meetings}
-    
-    # Convert timezone
-    tz = pytz.timezone(timezone)
-    
-    available_slots = []
-    duration_minutes = event_type.duration_minutes
-    
-    for schedule in schedules:
-        # Create datetime objects in the specified timezone
-        start_datetime = datetime.combine(selected_date, schedule.start_time)
-        start_datetime = tz.localize(start_datetime)
-        
-        end_datetime = datetime.combine(selected_date, schedule.end_time)
-        end_datetime = tz.localize(end_datetime)
-        
-        # Convert to UTC for comparison
-        start_utc = start_datetime.astimezone(pytz.UTC)
-        end_utc = end_datetime.astimezone(pytz.UTC)
-        
-        # Generate time slots
-        current = start_utc
-        while current + timedelta(minutes=duration_minutes) <= end_utc:
-            # Check if this slot is already booked
-            if current not in booked_times:
-                available_slots.append(current)
-            current += timedelta(minutes=duration_minutes)
-    
-    return sorted(available_slots)
-
-def is_time_slot_available(
-    db: Session,
+
+    slots_by_date = await _compute_available_slots(db, event_type, selected_date, selected_date, timezone)
+    return slots_by_date[selected_date]
+
+async def get_available_time_slots_for_range(
+    db: AsyncSession,
+    event_type_id: int,
+    start_date: date,
+    end_date: date,
+    timezone: str = "UTC",
+    event_type: Optional[EventTypeSchema] = None
+) -> Dict[date, List[datetime]]:
+    """
+    Calculate available time slots for every date from start_date to end_date (inclusive).
+    Schedules and meetings for the whole window are loaded with one query each,
+    then slots are generated for each day in memory.
+    Pass event_type if the caller already loaded it, to skip the lookup.
+    Returns a dict mapping each date to a list of datetime objects in UTC.
+    """
+    # Get event type
+    if event_type is None:
+        event_type = await event_type_cache.get_by_id(db, event_type_id)
+    if not event_type:
+        return {}
+
+    return await _compute_available_slots(db, event_type, start_date, end_date, timezone)
+
+async def is_time_slot_available(
+    db: AsyncSession,
     event_type_id: int,
     scheduled_at: datetime,
-    duration_minutes: int
+    duration_minutes: int,
+    timezone: str = "UTC",
+    event_type: Optional[EventTypeSchema] = None
 ) -> bool:
     """
     Check if a specific time slot is available for booking.
+    A time is available exactly when get_available_time_slots offers it for the
+    same timezone, since both run on the same interval engine.
+    Pass event_type if the caller already loaded it, to skip the lookup.
     """
-    # Convert to UTC if not already
-    if scheduled_at.tzinfo is None:
-        scheduled_at = pytz.UTC.localize(scheduled_at)
-    else:
-        scheduled_at = scheduled_at.astimezone(pytz.UTC)
-    
+    scheduled_at = _to_utc(scheduled_at)
+
     # Get event type
-    event_type = db.query(EventType).filter(EventType.id == event_type_id).first()
+    if event_type is None:
+        event_type = await event_type_cache.get_by_id(db, event_type_id)
     if not event_type:
         return False
-    
+
     # Check if duration matches
     if duration_minutes != event_type.duration_minutes:
         return False
-    
-    # Get the date and day of week
-    selected_date = scheduled_at.date()
-    day_of_week = selected_date.weekday()
-    
-    # Get availability schedules for this day
-    schedules = db.query(AvailabilitySchedule).filter(
-        AvailabilitySchedule.event_type_id == event_type_id,
-        AvailabilitySchedule.day_of_week == day_of_week
-    ).all()
-    
-    if not schedules:
-        return False
-    
-    # Check if the time falls within any availability schedule
-    slot_time = scheduled_at.time()
-    slot_end = (scheduled_at + timedelta(minutes=duration_minutes)).time()
-    
-    is_within_availability = False
-    for schedule in schedules:
-        if schedule.start_time <= slot_time and slot_end <= schedule.end_time:
-            is_within_availability = True
-            break
-    
-    if not is_within_availability:
-        return False
-    
-    # Check for conflicts with existing meetings
-    end_time = scheduled_at + timedelta(minutes=duration_minutes)
-    
-    conflicting_meeting = db.query(Meeting).filter(
-        Meeting.event_type_id == event_type_id,
-        Meeting.status == MeetingStatus.SCHEDULED,
-        Meeting.scheduled_at < end_time,
-        Meeting.scheduled_at + timedelta(minutes=event_type.duration_minutes) > scheduled_at
-    ).first()
-    
-    return conflicting_meeting is None
+
+    # Slots are generated per local date, so look at the date the slot starts on
+    selected_date = scheduled_at.astimezone(pytz.timezone(timezone)).date()
+    slots_by_date = await _compute_available_slots(db, event_type, selected_date, selected_date, timezone)
+
+    return scheduled_at in set(slots_by_date[selected_date])
+
+async def _compute_available_slots(
+    db: AsyncSession,
+    event_type: EventTypeSchema,
+    start_date: date,
+    end_date: date,
+    timezone: str
+) -> Dict[date, List[datetime]]:
+    """
+    Load the compiled schedule and the busy meetings for the window and run the interval engine.
+    Returns a dict mapping each date to a list of datetime objects in UTC.
+    """
+    days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+    schedule = await schedule_cache.get(db, event_type.id)
+    windows_by_date = [(day, schedule.windows(day, timezone)) for day in days]
+
+    all_windows = [window for _, windows in windows_by_date for window in windows]
+    if not all_windows:
+        return {day: [] for day in days}
+
+    # The host is busy during the meetings of every event type that end after
+    # the first window starts and start before the last window ends
+    busy = await get_busy_intervals(db, all_windows[0][0], all_windows[-1][1])
+
+    return _generate_slots(windows_by_date, busy, timedelta(minutes=event_type.duration_minutes))
+
+async def get_busy_intervals(db: AsyncSession, start: datetime, end: datetime) -> List[Interval]:
+    """
+    Merged intervals in which the host has a scheduled or completed meeting
+    overlapping [start, end), in UTC.
+
+    Every event type belongs to the same host, so a meeting of any event type
+    makes the host busy. The lookup is one range scan of the
+    ix_meetings_status_window index per busy status across all event types,
+    which covers the columns it reads and stays current as meetings are
+    booked and cancelled.
+    """
+    meetings = await db.execute(select(Meeting.scheduled_at, Meeting.ends_at).where(
+        Meeting.status.in_(BUSY_STATUSES),
+        Meeting.ends_at > start,
+        Meeting.scheduled_at < end
+    ))
+    return _merge_intervals((_to_utc(scheduled_at), _to_utc(ends_at)) for scheduled_at, ends_at in meetings)
+
+async def lock_host(db: AsyncSession) -> None:
+    """
+    Take the host's booking lock until the transaction ends.
+
+    Call it before any other statement of a booking transaction: bookings then
+    check availability one at a time, and the reads after it see every
+    booking committed before. An UPDATE rather than SELECT ... FOR UPDATE, so
+    SQLite, which has no row locks, takes its database write lock instead.
+    """
+    await db.execute(update(HostLock).where(HostLock.id == HOST_LOCK_ID).values(locked_at=func.now()))
+
+def _to_utc(value: datetime) -> datetime:
+    """Return a timezone-aware UTC datetime, treating naive values as UTC."""
+    if value.tzinfo is None:
+        return pytz.UTC.localize(value)
+    return value.astimezone(pytz.UTC)
+
+def _generate_slots(
+    windows_by_date: List[Tuple[date, List[Interval]]],
+    busy: List[Interval],
+    duration: timedelta
+) -> Dict[date, List[datetime]]:
+    """
+    Subtract the busy intervals from the availability windows in a single sweep
+    and emit the slots that fit in the remaining free time.
+
+    Windows must be sorted and disjoint across the whole list and busy must be
+    merged. Slots stay on the grid anchored at the start of their window, so a
+    meeting that starts off the grid blocks every slot it overlaps.
+    """
+    slots_by_date: Dict[date, List[datetime]] = {}
+    busy_index = 0
+
+    for day, windows in windows_by_date:
+        slots: List[datetime] = []
+        for window_start, window_end in windows:
+            # Skip busy intervals that end before this window starts
+            while busy_index < len(busy) and busy[busy_index][1] <= window_start:
+                busy_index += 1
+
+            free_start = window_start
+            index = busy_index
+            while free_start < window_end:
+                if index < len(busy) and busy[index][0] < window_end:
+                    busy_start, busy_end = busy[index]
+                    free_end = max(busy_start, free_start)
+                else:
+                    busy_end = None
+                    free_end = window_end
+
+                # Emit the grid slots that fit in [free_start, free_end)
+                steps = -((window_start - free_start) // duration)
+                current = window_start + steps * duration
+                while current + duration <= free_end:
+                    slots.append(current)
+                    current += duration
+
+                if busy_end is None:
+                    break
+                free_start = max(free_start, busy_end)
+                index += 1
+
+            # A busy interval that runs past this window may overlap the next one
+            busy_index = max(busy_index, index - 1)
+
+        slots_by_date[day] = slots
+
+    return slots_by_date
@@ -0,0 +1,94 @@
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+import pytz
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.meeting import MeetingStatus
+from app.schemas.event_type import EventType as EventTypeSchema
+from app.schemas.meeting import BulkBookingResult, MeetingCreate
+from app.services.booking_service import _to_utc, get_busy_intervals
+from app.services.event_type_cache import event_type_cache
+from app.services.schedule_cache import CompiledSchedule, Interval, schedule_cache
+
+async def validate_booking_batch(
+    db: AsyncSession,
+    bookings: List[MeetingCreate]
+) -> Tuple[List[BulkBookingResult], List[dict]]:
+    """
+    Validate a batch of bookings in memory, with one query for the busy time.
+
+    A row is accepted when it fits inside an availability window in the
+    timezone it was offered in, and overlaps neither a busy meeting of any
+    event type nor a row accepted earlier in the batch. Unlike single
+    bookings, imported meetings don't have to sit on the slot grid.
+
+    Returns one result per row, in order, and the column values of the
+    accepted rows, ready for an executemany insert into meetings.
+    """
+    results = [BulkBookingResult(index=index, accepted=False) for index in range(len(bookings))]
+
+    event_types: Dict[int, Optional[EventTypeSchema]] = {}
+    for event_type_id in sorted({booking.event_type_id for booking in bookings}):
+        event_types[event_type_id] = await event_type_cache.get_by_id(db, event_type_id)
+
+    # (index, booking, event type, start, end) of the rows that passed the static checks
+    candidates = []
+    for index, booking in enumerate(bookings):
+        event_type = event_types[booking.event_type_id]
+        if event_type is None:
+            results[index].reason = "Event type not found"
+        elif booking.timezone not in pytz.all_timezones_set:
+            results[index].reason = f"Unknown timezone: {booking.timezone}"
+        else:
+            start = _to_utc(booking.scheduled_at)
+            candidates.append((index, booking, event_type, start, start + timedelta(minutes=event_type.duration_minutes)))
+
+    if not candidates:
+        return results, []
+
+    event_type_ids = {candidate[2].id for candidate in candidates}
+
+    schedules: Dict[int, CompiledSchedule] = {}
+    for event_type_id in sorted(event_type_ids):
+        schedules[event_type_id] = await schedule_cache.get(db, event_type_id)
+
+    # Get the meetings of every event type that can overlap any row of the batch
+    busy = await get_busy_intervals(
+        db, min(candidate[3] for candidate in candidates), max(candidate[4] for candidate in candidates)
+    )
+
+    windows_cache: Dict[Tuple[int, date, str], List[Interval]] = {}
+    accepted: List[Interval] = []
+    accepted_rows = []
+
+    for index, booking, event_type, start, end in candidates:
+        local_date = start.astimezone(pytz.timezone(booking.timezone)).date()
+        key = (event_type.id, local_date, booking.timezone)
+        if key not in windows_cache:
+            windows_cache[key] = schedules[event_type.id].windows(local_date, booking.timezone)
+
+        if not any(window_start <= start and end <= window_end for window_start, window_end in windows_cache[key]):
+            results[index].reason = "Outside the availability of the event type"
+        elif _overlaps(busy, start, end):
+            results[index].reason = "Conflicts with an existing booking"
+        elif _overlaps(accepted, start, end):
+            results[index].reason = "Conflicts with an earlier row of the batch"
+        else:
+            insort(accepted, (start, end))
+            results[index].accepted = True
+            accepted_rows.append({
+                "event_type_id": event_type.id,
+                "invitee_name": booking.invitee_name,
+                "invitee_email": booking.invitee_email,
+                "scheduled_at": start,
+                "ends_at": end,
+                "status": MeetingStatus.SCHEDULED,
+            })
+
+    return results, accepted_rows
+
+def _overlaps(intervals: List[Interval], start, end) -> bool:
+    """Check [start, end) against sorted, disjoint intervals with a binary search."""
+    # Every interval before this index starts before end; the last of them ends latest
+    index = bisect_left(intervals, (end,))
+    return index > 0 and intervals[index - 1][1] > start
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import REPLICA_LAG_SECONDS, reads_replica
+from app.models.event_type import EventType
+from app.schemas.event_type import EventType as EventTypeSchema
+
+class EventTypeCache:
+    """
+    Read-through cache of event types, indexed by id and by slug.
+
+    Rows are cached as immutable EventType schemas rather than ORM objects, so
+    they can be shared across sessions and returned from routes directly.
+    Misses are not cached, so creating an event type needs no invalidation;
+    updates and deletes must call invalidate(). A row loaded while an
+    invalidation happened is returned but not stored, and so is a row read
+    from the replica within REPLICA_LAG_SECONDS of one, which may predate it.
+
+    The cache is per process: the TTL bounds how long other workers can serve
+    an event type that was changed through this one.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, EventTypeSchema]]" = OrderedDict()
+        self._ids_by_slug: Dict[str, int] = {}
+        self._generation = 0
+        self._invalidated_at = float("-inf")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_by_id(self, db: AsyncSession, event_type_id: int) -> Optional[EventTypeSchema]:
+        """Return the event type with the given id, loading it on a miss"""
+        event_type = self._get(event_type_id)
+        if event_type is not None:
+            return event_type
+        generation, read_at = self._generation, time.monotonic()
+        row = await db.scalar(select(EventType).where(EventType.id == event_type_id))
+        return self._load(row, generation, read_at if reads_replica(db) else None)
+
+    async def get_by_slug(self, db: AsyncSession, slug: str) -> Optional[EventTypeSchema]:
+        """Return the event type with the given slug, loading it on a miss"""
+        with self._lock:
+            event_type_id = self._ids_by_slug.get(slug)
+        if event_type_id is not None:
+            event_type = self._get(event_type_id)
+            if event_type is not None:
+                return event_type
+        else:
+            with self._lock:
+                self.misses += 1
+        generation, read_at = self._generation, time.monotonic()
+        row = await db.scalar(select(EventType).where(EventType.slug == slug))
+        return self._load(row, generation, read_at if reads_replica(db) else None)
+
+    def invalidate(self, event_type_id: int) -> None:
+        """Drop an event type after it was updated or deleted"""
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = time.monotonic()
+            self._remove(event_type_id)
+
+    def clear(self) -> None:
+        """Drop every event type"""
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = time.monotonic()
+            self._entries.clear()
+            self._ids_by_slug.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache size and its hit/miss counters"""
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _get(self, event_type_id: int) -> Optional[EventTypeSchema]:
+        with self._lock:
+            entry = self._entries.get(event_type_id)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(event_type_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(event_type_id)
+            self.hits += 1
+            return entry[1]
+
+    def _load(self, row: Optional[EventType], generation: int, replica_read_at: Optional[float]) -> Optional[EventTypeSchema]:
+        if row is None:
+            return None
+        event_type = EventTypeSchema.model_validate(row)
+        with self._lock:
+            if generation != self._generation:
+                return event_type
+            if replica_read_at is not None and replica_read_at < self._invalidated_at + REPLICA_LAG_SECONDS:
+                return event_type
+            self._remove(event_type.id)
+            self._entries[event_type.id] = (time.monotonic() + self.ttl_seconds, event_type)
+            self._ids_by_slug[event_type.slug] = event_type.id
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+        return event_type
+
+    def _remove(self, event_type_id: int) -> None:
+        entry = self._entries.pop(event_type_id, None)
+        if entry is not None and self._ids_by_slug.get(entry[1].slug) == event_type_id:
+            del self._ids_by_slug[entry[1].slug]
+
+event_type_cache = EventTypeCache(
+    maxsize=int(os.getenv("EVENT_TYPE_CACHE_MAXSIZE", "1024")),
+    ttl_seconds=float(os.getenv("EVENT_TYPE_CACHE_TTL_SECONDS", "300")),
+)
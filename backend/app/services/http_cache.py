@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request
+from app.schemas.event_type import EventType as EventTypeSchema
+from app.services.booking_service import _to_utc
+
+# Browsers and shared caches may store the response but must revalidate it
+# with its ETag before every reuse
+REVALIDATE = "public, no-cache"
+
+def http_date(value: datetime) -> str:
+    """Format a datetime for Last-Modified and similar headers"""
+    return format_datetime(_to_utc(value).astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+def event_type_etag(event_type: EventTypeSchema) -> str:
+    """
+    Strong ETag of an event type, from the revisions persisted with it.
+    Unlike updated_at, which has second precision on some databases, the
+    revisions change with every edit, including availability writes.
+    """
+    return f'"event-type-{event_type.id}-{event_type.revision}-{event_type.availability_revision}"'
+
+def availability_etag(event_type: EventTypeSchema) -> str:
+    """Strong ETag of an event type's availability schedules"""
+    return f'"availability-{event_type.id}-{event_type.availability_revision}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against a strong ETag.
+    Weak validators never match, as the strong comparison requires.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Decide whether a conditional GET can be answered with 304 Not Modified.
+    If-None-Match takes precedence; If-Modified-Since is only consulted when the
+    client sent no ETag.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since is None or since.tzinfo is None:
+        return False
+    # HTTP dates have second precision
+    return _to_utc(last_modified).replace(microsecond=0) <= since
@@ -0,0 +1,129 @@
+import re
+from datetime import datetime
+from typing import AsyncIterator, Tuple
+from urllib.parse import quote
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import ReadSessionLocal
+from app.models.meeting import Meeting, MeetingStatus
+from app.schemas.event_type import EventType as EventTypeSchema
+from app.services.booking_service import _to_utc
+
+# Rows fetched from the server-side cursor per round trip
+FEED_BATCH_SIZE = 500
+
+PRODUCT_ID = "-//Calendly Clone//Meetings Feed//EN"
+
+# Control characters, which can't appear in a content line (RFC 5545 3.1); a
+# CR or LF in a booking would otherwise end the line and start a new property
+CONTROL_CHARACTERS = re.compile(r"[\x00-\x08\x0a-\x1f\x7f]")
+
+# Characters left as they are in the mailto address; anything else is percent-encoded
+MAILTO_SAFE = "@.+-_!$&'*=?^`{|}~/"
+
+async def feed_version(db: AsyncSession, event_type: EventTypeSchema) -> Tuple[str, datetime]:
+    """
+    Return the strong ETag and Last-Modified time of an event type's feed.
+
+    Both come from one aggregate query over the event type's meetings, so a
+    conditional request is answered without reading or serializing any of them.
+    The meeting count is part of the ETag so that a meeting created in the same
+    second as the latest update still changes it.
+    """
+    count, latest = (await db.execute(
+        select(func.count(Meeting.id), func.max(Meeting.updated_at)).where(
+            Meeting.event_type_id == event_type.id
+        )
+    )).one()
+
+    last_modified = _to_utc(event_type.updated_at)
+    if latest is not None:
+        last_modified = max(last_modified, _to_utc(latest))
+
+    etag = f'"{event_type.id}-{count}-{int(last_modified.timestamp() * 1_000_000)}"'
+    return etag, last_modified
+
+async def stream_calendar(event_type: EventTypeSchema) -> AsyncIterator[str]:
+    """
+    Stream the meetings of an event type as an iCalendar feed.
+
+    Meetings are read through a server-side cursor and written out one batch of
+    VEVENTs at a time, so large calendars don't build up in memory. Cancelled
+    meetings stay in the feed with STATUS:CANCELLED so subscribed calendars
+    drop them.
+    """
+    yield _lines([
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(event_type.name)}",
+    ])
+
+    query = select(
+        Meeting.id,
+        Meeting.invitee_name,
+        Meeting.invitee_email,
+        Meeting.scheduled_at,
+        Meeting.ends_at,
+        Meeting.status,
+        Meeting.updated_at,
+    ).where(
+        Meeting.event_type_id == event_type.id
+    ).order_by(Meeting.scheduled_at.asc(), Meeting.id.asc())
+
+    async with ReadSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=FEED_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield "".join(_event(event_type, row) for row in rows)
+
+    yield _lines(["END:VCALENDAR"])
+
+def _event(event_type: EventTypeSchema, row) -> str:
+    meeting_id, invitee_name, invitee_email, scheduled_at, ends_at, status, updated_at = row
+    return _lines([
+        "BEGIN:VEVENT",
+        f"UID:meeting-{meeting_id}@calendly-clone",
+        f"DTSTAMP:{_format_datetime(updated_at)}",
+        f"LAST-MODIFIED:{_format_datetime(updated_at)}",
+        f"DTSTART:{_format_datetime(scheduled_at)}",
+        f"DTEND:{_format_datetime(ends_at)}",
+        f"SUMMARY:{_escape(f'{event_type.name} with {invitee_name}')}",
+        f"ATTENDEE;CN={_escape_param(invitee_name)}:mailto:{quote(invitee_email, safe=MAILTO_SAFE)}",
+        "STATUS:" + ("CANCELLED" if status == MeetingStatus.CANCELLED else "CONFIRMED"),
+        "END:VEVENT",
+    ])
+
+def _format_datetime(value: datetime) -> str:
+    return _to_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+def _escape(text: str) -> str:
+    """Escape a TEXT value (RFC 5545 3.3.11)"""
+    text = text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+    # Line breaks become escaped newlines, other control characters are dropped
+    return CONTROL_CHARACTERS.sub("", re.sub(r"\r\n|\r|\n", "\\\\n", text))
+
+def _escape_param(text: str) -> str:
+    """Quote a parameter value, which can't contain double quotes or control characters"""
+    return '"' + CONTROL_CHARACTERS.sub(" ", text).replace('"', "'") + '"'
+
+def _lines(lines) -> str:
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+def _fold(line: str) -> str:
+    """Fold a content line into chunks of at most 75 octets (RFC 5545 3.1)"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    chunks = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Don't split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(chunks)
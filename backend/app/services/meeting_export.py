@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, List
+from sqlalchemy import select, union_all
+from sqlalchemy.sql import Select
+from database.database import ReadSessionLocal
+from app.models.meeting import Meeting
+
+# Columns written for each exported meeting, in CSV column order
+EXPORT_FIELDS = [
+    "id",
+    "event_type_id",
+    "invitee_name",
+    "invitee_email",
+    "scheduled_at",
+    "ends_at",
+    "status",
+    "created_at",
+    "updated_at",
+]
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+def export_query(model=Meeting) -> Select:
+    """Base query selecting the exported columns of Meeting or ArchivedMeeting"""
+    return select(*(getattr(model, field) for field in EXPORT_FIELDS))
+
+def combine_tiers(queries: List[Select]) -> Select:
+    """Combine export queries of the meeting tiers into one, oldest meeting first"""
+    combined = union_all(*queries).subquery()
+    return select(combined).order_by(combined.c.scheduled_at.asc(), combined.c.id.asc())
+
+async def stream_meetings(query: Select, export_format: str) -> AsyncIterator[str]:
+    """
+    Stream the rows of an export query as NDJSON lines or CSV text.
+
+    Rows are read through a server-side cursor in batches of EXPORT_BATCH_SIZE
+    and written out batch by batch, so memory stays flat however many rows
+    there are. The generator opens its own session because it keeps running
+    after the request's dependencies have been torn down.
+    """
+    if export_format == "csv":
+        yield _csv_lines([EXPORT_FIELDS])
+
+    async with ReadSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            records = [[_serialize(value) for value in row] for row in rows]
+            if export_format == "csv":
+                yield _csv_lines(records)
+            else:
+                yield "".join(json.dumps(dict(zip(EXPORT_FIELDS, record))) + "\n" for record in records)
+
+def _csv_lines(records: List[list]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(records)
+    return buffer.getvalue()
+
+def _serialize(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):  # MeetingStatus
+        return value.value
+    return value
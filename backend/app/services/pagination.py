@@ -0,0 +1,21 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+def encode_cursor(scheduled_at: datetime, meeting_id: int) -> str:
+    """Encode the (scheduled_at, id) keyset position after a page into an opaque cursor"""
+    payload = json.dumps([scheduled_at.isoformat(), meeting_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor made by encode_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        scheduled_at, meeting_id = json.loads(payload)
+        return datetime.fromisoformat(scheduled_at), int(meeting_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -0,0 +1,169 @@
+import os
+import threading
+import time as monotonic_time
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import pytz
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import REPLICA_LAG_SECONDS, reads_replica
+from app.models.availability import AvailabilitySchedule
+
+# A half-open [start, end) interval of UTC datetimes
+Interval = Tuple[datetime, datetime]
+
+class CompiledSchedule:
+    """
+    Weekly availability template of an event type, compiled for slot generation.
+
+    The schedules of each weekday are merged once into offsets from local
+    midnight. On a day with a single UTC offset in the requested timezone,
+    which is every day but the ones with a DST change, the UTC windows are then
+    plain arithmetic on that offset. Days with a DST change are resolved
+    schedule by schedule with tz.localize, exactly like before.
+    """
+
+    def __init__(self, event_type_id: int, schedules: Iterable[Tuple[int, time, time]]):
+        self.event_type_id = event_type_id
+        self._times_by_day: Dict[int, List[Tuple[time, time]]] = {}
+        for day_of_week, start_time, end_time in schedules:
+            self._times_by_day.setdefault(day_of_week, []).append((start_time, end_time))
+        self._offsets_by_day: Dict[int, List[Tuple[timedelta, timedelta]]] = {
+            day_of_week: _merge_intervals(
+                (_since_midnight(start_time), _since_midnight(end_time))
+                for start_time, end_time in times
+                if start_time < end_time
+            )
+            for day_of_week, times in self._times_by_day.items()
+        }
+
+    def days_of_week(self) -> List[int]:
+        """Return the weekdays that have any availability"""
+        return sorted(day for day, offsets in self._offsets_by_day.items() if offsets)
+
+    def windows(self, selected_date: date, timezone: str) -> List[Interval]:
+        """Return the merged, sorted UTC windows of a date in the given timezone"""
+        offsets = self._offsets_by_day.get(selected_date.weekday())
+        if not offsets:
+            return []
+        utc_offset = _uniform_utc_offset(timezone, selected_date)
+        if utc_offset is None:
+            return _resolve_windows(selected_date, self._times_by_day[selected_date.weekday()], pytz.timezone(timezone))
+        midnight = datetime.combine(selected_date, time.min, tzinfo=pytz.UTC) - utc_offset
+        return [(midnight + start, midnight + end) for start, end in offsets]
+
+class ScheduleCache:
+    """
+    Read-through cache of compiled schedules, one per event type.
+
+    Event types without availability are cached too, as empty schedules.
+    Every availability write must call invalidate(); a schedule loaded while an
+    invalidation happened is returned but not stored, and so is one read from
+    the replica within REPLICA_LAG_SECONDS of an invalidation.
+
+    The cache is per process: the TTL bounds how long other workers can use a
+    schedule that was changed through this one.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[float, CompiledSchedule]]" = OrderedDict()
+        self._generation = 0
+        self._invalidated_at = float("-inf")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, db: AsyncSession, event_type_id: int) -> CompiledSchedule:
+        """Return the compiled schedule of an event type, loading it on a miss"""
+        with self._lock:
+            entry = self._entries.get(event_type_id)
+            if entry is not None and entry[0] > monotonic_time.monotonic():
+                self._entries.move_to_end(event_type_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation, read_at = self._generation, monotonic_time.monotonic()
+
+        rows = await db.execute(select(
+            AvailabilitySchedule.day_of_week,
+            AvailabilitySchedule.start_time,
+            AvailabilitySchedule.end_time
+        ).where(AvailabilitySchedule.event_type_id == event_type_id))
+        schedule = CompiledSchedule(event_type_id, rows.all())
+
+        replica = reads_replica(db)
+        with self._lock:
+            # A replica read this soon after an invalidation may predate it
+            if generation == self._generation and not (replica and read_at < self._invalidated_at + REPLICA_LAG_SECONDS):
+                self._entries[event_type_id] = (monotonic_time.monotonic() + self.ttl_seconds, schedule)
+                self._entries.move_to_end(event_type_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return schedule
+
+    def invalidate(self, event_type_id: int) -> None:
+        """Drop the schedule of an event type after its availability changed"""
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = monotonic_time.monotonic()
+            self._entries.pop(event_type_id, None)
+
+    def clear(self) -> None:
+        """Drop every schedule"""
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = monotonic_time.monotonic()
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache size and its hit/miss counters"""
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+@lru_cache(maxsize=16384)
+def _uniform_utc_offset(timezone: str, selected_date: date) -> Optional[timedelta]:
+    """
+    Return the UTC offset of a timezone on a date, or None if it changes that day.
+    The offset is resolved once per timezone and date, however many schedules
+    and event types use it.
+    """
+    tz = pytz.timezone(timezone)
+    start_offset = tz.localize(datetime.combine(selected_date, time.min)).utcoffset()
+    end_offset = tz.localize(datetime.combine(selected_date + timedelta(days=1), time.min)).utcoffset()
+    return start_offset if start_offset == end_offset else None
+
+def _resolve_windows(selected_date: date, times: List[Tuple[time, time]], tz) -> List[Interval]:
+    """
+    Resolve the schedules of a single date into merged, sorted UTC windows.
+    Overlapping or touching schedules collapse into one window.
+    """
+    windows = []
+    for start_time, end_time in times:
+        start_utc = tz.localize(datetime.combine(selected_date, start_time)).astimezone(pytz.UTC)
+        end_utc = tz.localize(datetime.combine(selected_date, end_time)).astimezone(pytz.UTC)
+        if start_utc < end_utc:
+            windows.append((start_utc, end_utc))
+    return _merge_intervals(windows)
+
+def _since_midnight(value: time) -> timedelta:
+    return timedelta(hours=value.hour, minutes=value.minute, seconds=value.second, microseconds=value.microsecond)
+
+def _merge_intervals(intervals: Iterable[Tuple]) -> List[Tuple]:
+    """Sort intervals and merge the ones that overlap or touch."""
+    merged: List[Tuple] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+schedule_cache = ScheduleCache(
+    maxsize=int(os.getenv("SCHEDULE_CACHE_MAXSIZE", "1024")),
+    ttl_seconds=float(os.getenv("SCHEDULE_CACHE_TTL_SECONDS", "300")),
+)
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent computations into one.
+
+    The first caller for a key starts the computation as a task of its own;
+    callers that arrive with the same key while it runs wait for that task
+    instead of starting another, and all of them get its result or its error.
+    The key is forgotten as soon as the task finishes, so nothing is cached
+    here: a later call computes afresh.
+
+    Because the task outlives any one caller, a caller that goes away (e.g. a
+    client that disconnects) doesn't cancel it for the others. The computation
+    must therefore not use anything scoped to the caller, like its request's
+    database session. Everything runs on the event loop thread, so no locking
+    is needed.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, "asyncio.Task"] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        # Shielded so a cancelled caller leaves the task running for the rest
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._flights), "started": self.started, "coalesced": self.coalesced}
+
+    def _finish(self, key: Hashable, task: "asyncio.Task") -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Mark the error as seen in case every caller was cancelled before it came
+        if not task.cancelled():
+            task.exception()
+
+# Computations of the slots of one event type, date range and timezone
+slot_flights = SingleFlight()
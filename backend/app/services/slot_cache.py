@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from database.database import REPLICA_LAG_SECONDS
+
+# (event_type_id, date, timezone)
+SlotCacheKey = Tuple[int, date, str]
+
+# Widest UTC offset in use; a meeting can land on this many hours either side
+# of its UTC date once the slots are viewed in another timezone
+MAX_UTC_OFFSET = timedelta(hours=14)
+
+class SlotCache:
+    """
+    Bounded LRU cache of computed slot lists, with a TTL per entry.
+
+    Entries are indexed by event type so availability writes can evict exactly
+    the entries they affect; meetings block every event type, so meeting writes
+    evict their dates across all of them. Each event type also has a generation
+    number that is bumped on every invalidation that can affect it; a result
+    computed before an invalidation is dropped instead of being stored, so a
+    slow read can't resurrect stale slots. So is a result read from the
+    replica within REPLICA_LAG_SECONDS of an invalidation, which may not
+    include the write behind it yet.
+
+    The cache is per process: the TTL bounds how long other workers can serve
+    slots that a write in this process has already invalidated.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl_seconds: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[SlotCacheKey, Tuple[float, List[datetime]]]" = OrderedDict()
+        self._keys_by_event_type: Dict[int, Set[SlotCacheKey]] = {}
+        self._generations: Dict[int, int] = {}
+        self._shared_generation = 0  # Bumped by invalidations that span every event type
+        self._invalidated_at: Dict[int, float] = {}
+        self._shared_invalidated_at = float("-inf")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self, event_type_id: int) -> int:
+        """Return the current generation of an event type, to pass back to set()"""
+        with self._lock:
+            return self._generation(event_type_id)
+
+    def get(self, event_type_id: int, selected_date: date, timezone: str) -> Optional[List[datetime]]:
+        """Return the cached slots for a key, or None on a miss"""
+        key = (event_type_id, selected_date, timezone)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, slots = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return slots
+
+    def set(
+        self,
+        event_type_id: int,
+        selected_date: date,
+        timezone: str,
+        slots: List[datetime],
+        generation: Optional[int] = None,
+        replica_read_at: Optional[float] = None
+    ) -> None:
+        """
+        Store the slots for a key.
+        If generation is given and the event type was invalidated since, the
+        slots are stale and are not stored. Pass replica_read_at, the monotonic
+        time a replica read started, to skip storing a read that may lag behind
+        a recent invalidation.
+        """
+        key = (event_type_id, selected_date, timezone)
+        with self._lock:
+            if generation is not None and generation != self._generation(event_type_id):
+                return
+            if replica_read_at is not None:
+                invalidated_at = max(self._invalidated_at.get(event_type_id, float("-inf")), self._shared_invalidated_at)
+                if replica_read_at < invalidated_at + REPLICA_LAG_SECONDS:
+                    return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, slots)
+            self._entries.move_to_end(key)
+            self._keys_by_event_type.setdefault(event_type_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate_event_type(self, event_type_id: int) -> None:
+        """Evict every entry of an event type, e.g. after its availability changed"""
+        with self._lock:
+            self._bump(event_type_id)
+            for key in self._keys_by_event_type.pop(event_type_id, set()):
+                del self._entries[key]
+                self.invalidations += 1
+
+    def invalidate_dates(self, dates: Iterable[date]) -> None:
+        """Evict the entries of every event type for the given dates, in every timezone"""
+        dates = set(dates)
+        with self._lock:
+            self._shared_generation += 1
+            self._shared_invalidated_at = time.monotonic()
+            for key in [key for key in self._entries if key[1] in dates]:
+                self._remove(key)
+                self.invalidations += 1
+
+    def invalidate_meeting(self, scheduled_at: datetime, ends_at: datetime) -> None:
+        """
+        Evict the entries whose slots a meeting can overlap, after it was booked,
+        cancelled or completed. Meetings block every event type of the host, so
+        this evicts those dates for all of them.
+        """
+        self.invalidate_dates(meeting_dates(scheduled_at, ends_at))
+
+    def clear(self) -> None:
+        """Evict every entry"""
+        with self._lock:
+            for event_type_id in list(self._generations) + list(self._keys_by_event_type):
+                self._bump(event_type_id)
+            self._shared_invalidated_at = time.monotonic()
+            self._entries.clear()
+            self._keys_by_event_type.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache size and its hit/miss/eviction counters"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _generation(self, event_type_id: int) -> int:
+        # Both counters only grow, so the sum changes whenever either is bumped
+        return self._generations.get(event_type_id, 0) + self._shared_generation
+
+    def _bump(self, event_type_id: int) -> None:
+        self._generations[event_type_id] = self._generations.get(event_type_id, 0) + 1
+        self._invalidated_at[event_type_id] = time.monotonic()
+
+    def _remove(self, key: SlotCacheKey) -> None:
+        del self._entries[key]
+        keys = self._keys_by_event_type.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_event_type[key[0]]
+
+def meeting_dates(scheduled_at: datetime, ends_at: datetime) -> List[date]:
+    """Dates whose slots a meeting can overlap, in any timezone"""
+    first_date = (scheduled_at - MAX_UTC_OFFSET).date()
+    last_date = (ends_at + MAX_UTC_OFFSET).date()
+    return [first_date + timedelta(days=offset) for offset in range((last_date - first_date).days + 1)]
+
+slot_cache = SlotCache(
+    maxsize=int(os.getenv("SLOT_CACHE_MAXSIZE", "4096")),
+    ttl_seconds=float(os.getenv("SLOT_CACHE_TTL_SECONDS", "300")),
+)
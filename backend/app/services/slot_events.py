@@ -0,0 +1,140 @@
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import AsyncIterator, Dict, NamedTuple, Optional, Set
+from app.services.booking_service import _to_utc
+
+# Event names sent to the booking page
+SLOT_TAKEN = "slot_taken"  # A meeting now blocks [start, end); drop the offered slots that overlap it
+SLOT_FREED = "slot_freed"  # [start, end) may have slots again; refetch the dates it touches
+RESYNC = "resync"  # Deltas were missed or the schedule changed; refetch the whole range
+
+class SlotEvent(NamedTuple):
+    id: int
+    kind: str
+    start: Optional[datetime]  # None for a resync of the whole range
+    end: Optional[datetime]
+
+class Subscription:
+    """One open event stream: the event type and the UTC window of the dates it shows"""
+    __slots__ = ("event_type_id", "start", "end", "queue", "overflowed")
+
+    def __init__(self, event_type_id: int, start: datetime, end: datetime, queue_size: int):
+        self.event_type_id = event_type_id
+        self.start = start
+        self.end = end
+        self.queue: "asyncio.Queue[SlotEvent]" = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def deliver(self, event: SlotEvent) -> bool:
+        """Queue an event for the stream; returns whether it was queued"""
+        # A slow client gets a resync instead of an ever-growing backlog
+        if self.overflowed:
+            return False
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            return False
+        return True
+
+class SlotEventHub:
+    """
+    In-process fan-out of slot changes to the open event streams.
+
+    Publishing only puts the event on the bounded queue of each matching
+    subscription, so it costs a few microseconds per stream and never waits on
+    a client. Each idle stream is a coroutine parked on its queue, which keeps
+    thousands of them cheap on one event loop. Everything runs on the event
+    loop thread, so no locking is needed.
+
+    The hub only sees the writes of its own process; with several workers a
+    stream misses the bookings made through the others until it refetches.
+    """
+
+    def __init__(self, queue_size: int = 100, keepalive_seconds: float = 15.0):
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._last_id = 0
+        self.published = 0
+        self.delivered = 0
+
+    def subscribe(self, event_type_id: int, start: datetime, end: datetime) -> Subscription:
+        subscription = Subscription(event_type_id, _to_utc(start), _to_utc(end), self.queue_size)
+        self._subscriptions.setdefault(event_type_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.event_type_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.event_type_id]
+
+    def publish_busy_change(self, kind: str, start: datetime, end: datetime) -> None:
+        """
+        Tell the streams that show any part of [start, end) that the host became
+        busy or free then. Busy time is shared by every event type of the host,
+        so this goes to the streams of all of them.
+        """
+        event = self._event(kind, _to_utc(start), _to_utc(end))
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                if subscription.start < event.end and event.start < subscription.end and subscription.deliver(event):
+                    self.delivered += 1
+
+    def publish_resync(self, event_type_id: int) -> None:
+        """Tell the streams of an event type to refetch, e.g. after its availability or duration changed"""
+        event = self._event(RESYNC, None, None)
+        for subscription in self._subscriptions.get(event_type_id, ()):
+            if subscription.deliver(event):
+                self.delivered += 1
+
+    async def stream(self, subscription: Subscription, resync_first: bool = False) -> AsyncIterator[str]:
+        """
+        Yield the events of a subscription in the text/event-stream format until
+        the client goes away, with a comment every keepalive_seconds so proxies
+        keep idle connections open.
+        """
+        try:
+            # Tell the client how long to wait before reconnecting
+            yield f"retry: {int(self.keepalive_seconds * 1000)}\n\n"
+            if resync_first:
+                yield _format(self._event(RESYNC, None, None))
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if subscription.overflowed:
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    subscription.overflowed = False
+                    event = self._event(RESYNC, None, None)
+                yield _format(event)
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+        }
+
+    def _event(self, kind: str, start: Optional[datetime], end: Optional[datetime]) -> SlotEvent:
+        self._last_id += 1
+        self.published += 1
+        return SlotEvent(self._last_id, kind, start, end)
+
+def _format(event: SlotEvent) -> str:
+    data = {} if event.start is None else {"start": event.start.isoformat(), "end": event.end.isoformat()}
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {json.dumps(data)}\n\n"
+
+slot_events = SlotEventHub(
+    queue_size=int(os.getenv("SLOT_EVENTS_QUEUE_SIZE", "100")),
+    keepalive_seconds=float(os.getenv("SLOT_EVENTS_KEEPALIVE_SECONDS", "15")),
+)
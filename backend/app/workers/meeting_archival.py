@@ -0,0 +1,107 @@
+"""
+Move old completed and cancelled meetings to the archived_meetings table.
+
+The meetings table is what booking conflict checks, slot generation and the
+upcoming list work on. Archiving what ended more than MEETING_ARCHIVE_AFTER_DAYS
+ago keeps it, and its indexes, sized by recent activity rather than by how
+long the app has been running. The past meetings list, single meeting lookups
+and the export read both tables.
+
+The app runs the job every MEETING_ARCHIVE_INTERVAL_SECONDS (0 disables it,
+e.g. when a cron job runs the CLI instead):
+
+Run: python -m app.workers.meeting_archival [--after-days 180] [--batch-size 1000] [--loop]
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+import pytz
+from sqlalchemy import delete, insert, select
+from database.database import AsyncSessionLocal
+from app.models.archived_meeting import ArchivedMeeting
+from app.models.meeting import Meeting, MeetingStatus
+from app.workers.scheduler import run_periodically
+
+MEETING_ARCHIVE_AFTER_DAYS = int(os.getenv("MEETING_ARCHIVE_AFTER_DAYS", "180"))
+MEETING_ARCHIVE_INTERVAL_SECONDS = float(os.getenv("MEETING_ARCHIVE_INTERVAL_SECONDS", "3600"))
+MEETING_ARCHIVE_BATCH_SIZE = int(os.getenv("MEETING_ARCHIVE_BATCH_SIZE", "1000"))
+
+# Scheduled meetings stay hot until the completion job has completed them
+ARCHIVED_STATUSES = (MeetingStatus.COMPLETED, MeetingStatus.CANCELLED)
+
+# Columns copied from meetings to archived_meetings
+ARCHIVED_COLUMNS = [
+    "id", "event_type_id", "invitee_name", "invitee_email",
+    "scheduled_at", "ends_at", "status", "created_at", "updated_at",
+]
+
+async def archive_old_meetings(
+    after_days: int = MEETING_ARCHIVE_AFTER_DAYS,
+    batch_size: int = MEETING_ARCHIVE_BATCH_SIZE,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Move the completed and cancelled meetings that ended more than after_days
+    ago to the archive, oldest first.
+
+    Each chunk of batch_size meetings is copied and deleted from the meetings
+    table in one transaction, so a meeting is always in exactly one of the two
+    tables.
+    Returns the number of meetings archived.
+    """
+    cutoff = (now or datetime.now(pytz.UTC)) - timedelta(days=after_days)
+    archived = 0
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(Meeting.id)
+                .where(Meeting.status.in_(ARCHIVED_STATUSES), Meeting.ends_at < cutoff)
+                .order_by(Meeting.ends_at)
+                .limit(batch_size)
+            )).all()
+            if not rows:
+                return archived
+
+            ids = [row.id for row in rows]
+            await db.execute(insert(ArchivedMeeting).from_select(
+                ARCHIVED_COLUMNS,
+                select(*(getattr(Meeting, column) for column in ARCHIVED_COLUMNS)).where(Meeting.id.in_(ids))
+            ))
+
+            await db.execute(delete(Meeting).where(Meeting.id.in_(ids)))
+            await db.commit()
+        archived += len(rows)
+
+        if len(rows) < batch_size:
+            return archived
+        # Let requests waiting on the event loop run between chunks
+        await asyncio.sleep(0)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Move old completed and cancelled meetings to the archive.")
+    parser.add_argument("--after-days", type=int, default=MEETING_ARCHIVE_AFTER_DAYS,
+                        help=f"archive meetings that ended this many days ago (default {MEETING_ARCHIVE_AFTER_DAYS})")
+    parser.add_argument("--batch-size", type=int, default=MEETING_ARCHIVE_BATCH_SIZE,
+                        help=f"meetings moved per transaction (default {MEETING_ARCHIVE_BATCH_SIZE})")
+    parser.add_argument("--loop", action="store_true",
+                        help="keep running every MEETING_ARCHIVE_INTERVAL_SECONDS instead of once")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.loop:
+        asyncio.run(run_periodically(
+            lambda: archive_old_meetings(args.after_days, args.batch_size),
+            max(MEETING_ARCHIVE_INTERVAL_SECONDS, 1),
+            "Meetings archived"
+        ))
+    else:
+        print(f"Archived {asyncio.run(archive_old_meetings(args.after_days, args.batch_size))} meetings.")
+
+if __name__ == "__main__":
+    main()
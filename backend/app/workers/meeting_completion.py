@@ -0,0 +1,106 @@
+"""
+Mark meetings that have ended as COMPLETED.
+
+Scheduled meetings are only ever cancelled by users, so without this job the
+SCHEDULED set keeps every meeting ever booked. Completing them in the
+background keeps it down to the meetings that are still ahead, which is what
+the upcoming list filters on. Completed meetings still count as busy time, so
+this doesn't change which slots are offered.
+
+The app runs the job every MEETING_COMPLETION_INTERVAL_SECONDS (0 disables
+it, e.g. when a cron job runs the CLI instead):
+
+Run: python -m app.workers.meeting_completion [--batch-size 1000] [--loop]
+"""
+import argparse
+import asyncio
+import logging
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+import pytz
+from sqlalchemy import select, update
+from database.database import AsyncSessionLocal
+from app.models.meeting import Meeting, MeetingStatus
+from app.services.booking_rollups import apply_changes, status_change
+from app.workers.scheduler import run_periodically
+
+MEETING_COMPLETION_INTERVAL_SECONDS = float(os.getenv("MEETING_COMPLETION_INTERVAL_SECONDS", "60"))
+MEETING_COMPLETION_BATCH_SIZE = int(os.getenv("MEETING_COMPLETION_BATCH_SIZE", "1000"))
+
+async def complete_past_meetings(batch_size: int = MEETING_COMPLETION_BATCH_SIZE, now: Optional[datetime] = None) -> int:
+    """
+    Mark the scheduled meetings that ended before now as completed.
+
+    Works through them in chunks of batch_size, oldest first, each in its own
+    short transaction, so row locks are held for one chunk at a time and
+    bookings keep going while a large backlog is worked off.
+    Returns the number of meetings completed.
+    """
+    now = now or datetime.now(pytz.UTC)
+    completed = 0
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            # Locked so a concurrent cancellation or run waits for this chunk
+            rows = (await db.execute(
+                select(Meeting.id, Meeting.event_type_id, Meeting.scheduled_at, Meeting.ends_at)
+                .where(Meeting.status == MeetingStatus.SCHEDULED, Meeting.ends_at <= now)
+                .order_by(Meeting.ends_at)
+                .limit(batch_size)
+                .with_for_update()
+            )).all()
+            if not rows:
+                return completed
+
+            # Re-check the status so a meeting cancelled since the select stays cancelled
+            ids = [row.id for row in rows]
+            result = await db.execute(
+                update(Meeting)
+                .where(Meeting.id.in_(ids), Meeting.status == MeetingStatus.SCHEDULED)
+                .values(status=MeetingStatus.COMPLETED)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != len(rows):
+                # Some changed since the select, which the row locks rule out
+                # on MySQL; retry the chunk so the rollups count what changed
+                await db.rollback()
+                continue
+
+            changes = Counter()
+            for row in rows:
+                changes.update(status_change(
+                    row.event_type_id, row.scheduled_at, MeetingStatus.SCHEDULED, MeetingStatus.COMPLETED
+                ))
+            await apply_changes(db, changes)
+            await db.commit()
+        completed += result.rowcount
+
+        if len(rows) < batch_size:
+            return completed
+        # Let requests waiting on the event loop run between chunks
+        await asyncio.sleep(0)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mark meetings that have ended as completed.")
+    parser.add_argument("--batch-size", type=int, default=MEETING_COMPLETION_BATCH_SIZE,
+                        help=f"meetings updated per transaction (default {MEETING_COMPLETION_BATCH_SIZE})")
+    parser.add_argument("--loop", action="store_true",
+                        help="keep running every MEETING_COMPLETION_INTERVAL_SECONDS instead of once")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.loop:
+        asyncio.run(run_periodically(
+            lambda: complete_past_meetings(args.batch_size),
+            max(MEETING_COMPLETION_INTERVAL_SECONDS, 1),
+            "Meetings marked as completed"
+        ))
+    else:
+        print(f"Marked {asyncio.run(complete_past_meetings(args.batch_size))} meetings as completed.")
+
+if __name__ == "__main__":
+    main()
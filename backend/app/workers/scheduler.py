@@ -0,0 +1,23 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+async def run_periodically(job: Callable[[], Awaitable[int]], interval_seconds: float, description: str) -> None:
+    """
+    Run a background job every interval_seconds until cancelled.
+    The job returns the number of rows it handled, which is logged as
+    "<description>: <count>" when non-zero.
+    """
+    while True:
+        try:
+            count = await job()
+            if count:
+                logger.info("%s: %d", description, count)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Try again on the next run rather than stopping the job for good
+            logger.exception("%s failed", description)
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,231 @@
+"""
+Benchmark the booking service and the API against a seeded SQLite database.
+
+The database is filled by the generator in database/seed.py with a
+configurable number of event types, schedules and meetings, then every
+operation runs for a number of iterations. Latency percentiles and the
+number of SQL statements per operation are printed and saved as JSON, so
+runs before and after a change can be compared.
+
+Run: python benchmarks/run.py --meetings 10000 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time as timer
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+# Add parent directory to path so we can import app modules
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+DEFAULT_OUTPUT = "benchmark-results.json"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--event-types", type=int, default=20, help="number of event types (default 20)")
+    parser.add_argument("--hours-per-day", type=int, default=12, help="available hours per weekday (default 12)")
+    parser.add_argument("--windows-per-day", type=int, default=2, help="availability windows per weekday (default 2)")
+    parser.add_argument("--meetings", type=int, default=10000, help="number of meetings (default 10000)")
+    parser.add_argument("--days", type=int, default=1095, help="days the meetings span, centred on today (default 1095)")
+    parser.add_argument("--iterations", type=int, default=200, help="timed runs per operation (default 200)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default 42)")
+    parser.add_argument("--database", help="SQLite file to use (default: a temporary file)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help=f"JSON results file (default {DEFAULT_OUTPUT})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    database = args.database or os.path.join(tempfile.mkdtemp(prefix="calendly-bench-"), "bench.db")
+    if os.path.exists(database):
+        os.remove(database)
+
+    # Point the app at the benchmark database before anything imports it
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("DB_ECHO", "false")
+
+    from database.seed import generate
+
+    started = timer.perf_counter()
+    try:
+        event_types = generate(
+            event_types=args.event_types,
+            meetings=args.meetings,
+            days_back=args.days // 2,
+            days_ahead=args.days - args.days // 2,
+            hours_per_day=args.hours_per_day,
+            windows_per_day=args.windows_per_day,
+            seed=args.seed,
+            quiet=True,
+        )
+    except ValueError as e:
+        print(f"Error generating data: {e}")
+        sys.exit(1)
+    seed_seconds = timer.perf_counter() - started
+    print(f"Seeded {args.event_types} event types and {args.meetings} meetings in {seed_seconds:.1f}s")
+    rng = random.Random(args.seed)
+
+    results = {}
+    results.update(asyncio.run(run_service_benchmarks(event_types, args, rng)))
+    results.update(run_api_benchmarks(event_types, args, rng))
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "database")},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": "sqlite",
+        },
+        "seed_seconds": round(seed_seconds, 3),
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+
+    print_table(results)
+    print(f"Results saved to {args.output}")
+
+class QueryCounter:
+    """Count the SQL statements an engine executes"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+class Recorder:
+    """Collect the latency and query count of each run of an operation"""
+
+    def __init__(self, counter):
+        self.counter = counter
+        self.samples = {}
+
+    def start(self):
+        return timer.perf_counter(), self.counter.count
+
+    def stop(self, name, started):
+        started_at, queries = started
+        elapsed = timer.perf_counter() - started_at
+        self.samples.setdefault(name, []).append((elapsed, self.counter.count - queries))
+
+    def summary(self):
+        return {name: summarize(samples) for name, samples in self.samples.items()}
+
+async def run_service_benchmarks(event_types, args, rng):
+    from database.database import AsyncSessionLocal, async_engine
+    from app.services.booking_service import (
+        get_available_time_slots, get_available_time_slots_for_range, is_time_slot_available
+    )
+
+    recorder = Recorder(QueryCounter(async_engine.sync_engine))
+    today = date.today()
+
+    for _ in range(args.iterations):
+        event_type_id, _, duration = rng.choice(event_types)
+        selected_date = today + timedelta(days=rng.randrange(args.days // 2))
+
+        async with AsyncSessionLocal() as db:
+            started = recorder.start()
+            slots = await get_available_time_slots(db, event_type_id, selected_date)
+            recorder.stop("service.get_available_time_slots", started)
+
+        async with AsyncSessionLocal() as db:
+            started = recorder.start()
+            await get_available_time_slots_for_range(db, event_type_id, selected_date, selected_date + timedelta(days=13))
+            recorder.stop("service.get_available_time_slots_for_range[14d]", started)
+
+        scheduled_at = slots[0] if slots else datetime.combine(selected_date, time(9))
+        async with AsyncSessionLocal() as db:
+            started = recorder.start()
+            await is_time_slot_available(db, event_type_id, scheduled_at, duration)
+            recorder.stop("service.is_time_slot_available", started)
+
+    return recorder.summary()
+
+def run_api_benchmarks(event_types, args, rng):
+    from fastapi.testclient import TestClient
+    from database.database import async_engine
+    from main import app
+    from app.services.slot_cache import slot_cache
+
+    recorder = Recorder(QueryCounter(async_engine.sync_engine))
+    today = date.today()
+
+    with TestClient(app) as client:
+        def timed(name, method, url, expected, **kwargs):
+            started = recorder.start()
+            response = client.request(method, url, **kwargs)
+            recorder.stop(name, started)
+            if response.status_code != expected:
+                raise RuntimeError(f"{name}: {method} {url} returned {response.status_code}: {response.text}")
+            return response
+
+        for iteration in range(args.iterations):
+            event_type_id, slug, _ = rng.choice(event_types)
+            selected_date = today + timedelta(days=rng.randrange(args.days // 2))
+
+            slot_cache.clear()
+            timed("api.available_slots[cold]", "GET", f"/api/bookings/available/{slug}", 200,
+                  params={"date": selected_date.isoformat()})
+            response = timed("api.available_slots[warm]", "GET", f"/api/bookings/available/{slug}", 200,
+                             params={"date": selected_date.isoformat()})
+            timed("api.available_slots_range[14d]", "GET", f"/api/bookings/available/{slug}", 200,
+                  params={"start_date": selected_date.isoformat(),
+                          "end_date": (selected_date + timedelta(days=13)).isoformat()})
+
+            slots = response.json()["available_slots"]
+            if slots:
+                timed("api.create_booking", "POST", "/api/bookings/", 201, json={
+                    "event_type_id": event_type_id,
+                    "invitee_name": f"Benchmark {iteration}",
+                    "invitee_email": f"benchmark{iteration}@example.com",
+                    "scheduled_at": slots[0],
+                })
+
+            timed("api.event_type_by_slug", "GET", f"/api/event-types/slug/{slug}", 200)
+            timed("api.meetings_upcoming", "GET", "/api/meetings/upcoming", 200, params={"limit": 50})
+            timed("api.meetings_past", "GET", "/api/meetings/past", 200, params={"limit": 50})
+            timed("api.meetings_list[event_type]", "GET", "/api/meetings/", 200,
+                  params={"event_type_id": event_type_id, "limit": 50})
+
+    return recorder.summary()
+
+def summarize(samples):
+    latencies = sorted(elapsed * 1000 for elapsed, _ in samples)
+    queries = [count for _, count in samples]
+    return {
+        "runs": len(samples),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p90_ms": round(percentile(latencies, 90), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+        "queries_mean": round(sum(queries) / len(queries), 2),
+        "queries_max": max(queries),
+    }
+
+def percentile(sorted_values, rank):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, -(-rank * len(sorted_values) // 100) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+def print_table(results):
+    header = f"{'operation':<50} {'runs':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        print(f"{name:<50} {result['runs']:>5} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+              f"{result['p99_ms']:>9.2f} {result['queries_mean']:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Apply pending schema migrations to the database in DATABASE_URL.
+
+Each module in database/migrations named NNNN_description.py defines an
+upgrade(connection) function. Migrations run in order and are recorded in
+the schema_migrations table so they only run once. The runner commits after
+each migration; long backfills may also commit between batches. Migrations
+are safe to run on a database created by seed.py, which already has the
+latest schema.
+
+Run: python database/migrate.py
+"""
+import importlib
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import app modules
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, insert, select
+from database.database import engine
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("name", String(255), primary_key=True),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+def pending_migrations(applied):
+    """Return the names of the migration modules not applied yet, in order"""
+    names = sorted(path.stem for path in MIGRATIONS_DIR.glob("[0-9][0-9][0-9][0-9]_*.py"))
+    return [name for name in names if name not in applied]
+
+def migrate():
+    metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(schema_migrations.c.name)).scalars())
+
+    for name in pending_migrations(applied):
+        module = importlib.import_module(f"database.migrations.{name}")
+        print(f"Applying {name}...")
+        with engine.connect() as connection:
+            module.upgrade(connection)
+            connection.execute(insert(schema_migrations).values(name=name))
+            connection.commit()
+
+    print("Database is up to date.")
+
+if __name__ == "__main__":
+    migrate()
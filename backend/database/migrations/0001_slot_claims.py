@@ -0,0 +1,33 @@
+"""
+Add the slot_claims table and claim the slots of existing scheduled meetings.
+
+The claims were replaced by the host lock and the table is dropped again by
+0012, so it is defined here rather than imported from the models.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, Table, insert, select
+from app.models import Meeting, MeetingStatus
+
+metadata = MetaData()
+Table("event_types", metadata, Column("id", Integer, primary_key=True))
+slot_claims = Table(
+    "slot_claims",
+    metadata,
+    Column("event_type_id", Integer, ForeignKey("event_types.id", ondelete="CASCADE"), primary_key=True),
+    Column("slot_start", DateTime(timezone=True), primary_key=True),
+)
+
+def upgrade(connection):
+    slot_claims.create(connection, checkfirst=True)
+
+    # One claim per booked slot; legacy double bookings collapse into one claim
+    booked_slots = select(Meeting.event_type_id, Meeting.scheduled_at).where(
+        Meeting.status == MeetingStatus.SCHEDULED,
+        ~select(slot_claims.c.event_type_id).where(
+            slot_claims.c.event_type_id == Meeting.event_type_id,
+            slot_claims.c.slot_start == Meeting.scheduled_at
+        ).exists()
+    ).group_by(Meeting.event_type_id, Meeting.scheduled_at)
+
+    connection.execute(
+        insert(slot_claims).from_select(["event_type_id", "slot_start"], booked_slots)
+    )
@@ -0,0 +1,53 @@
+"""
+Persist each meeting's end time and add the composite indexes used by the
+overlap checks and slot generation.
+
+ends_at is added as nullable, backfilled from the event type duration in
+batches (committing after each so locks stay short), then made NOT NULL
+where the database supports altering the column.
+"""
+from datetime import timedelta
+from sqlalchemy import DateTime, bindparam, inspect, select, text
+from app.models import AvailabilitySchedule, EventType, Meeting
+
+BATCH_SIZE = 1000
+
+NEW_INDEXES = ("ix_meetings_event_type_status_window", "ix_availability_event_type_day")
+
+def upgrade(connection):
+    meetings = Meeting.__table__
+    column_type = DateTime(timezone=True).compile(dialect=connection.dialect)
+
+    columns = {column["name"] for column in inspect(connection).get_columns("meetings")}
+    if "ends_at" not in columns:
+        connection.execute(text(f"ALTER TABLE meetings ADD COLUMN ends_at {column_type} NULL"))
+        connection.commit()
+
+    # Backfill in batches of rows still missing ends_at
+    set_ends_at = (
+        meetings.update()
+        .where(meetings.c.id == bindparam("meeting_id"))
+        .values(ends_at=bindparam("meeting_ends_at"))
+    )
+    while True:
+        rows = connection.execute(
+            select(meetings.c.id, meetings.c.scheduled_at, EventType.duration_minutes)
+            .join(EventType, EventType.id == meetings.c.event_type_id)
+            .where(meetings.c.ends_at.is_(None))
+            .order_by(meetings.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(set_ends_at, [
+            {"meeting_id": meeting_id, "meeting_ends_at": scheduled_at + timedelta(minutes=duration)}
+            for meeting_id, scheduled_at, duration in rows
+        ])
+        connection.commit()
+
+    if connection.dialect.name == "mysql":
+        connection.execute(text(f"ALTER TABLE meetings MODIFY ends_at {column_type} NOT NULL"))
+
+    for index in list(meetings.indexes) + list(AvailabilitySchedule.__table__.indexes):
+        if index.name in NEW_INDEXES:
+            index.create(connection, checkfirst=True)
@@ -0,0 +1,10 @@
+"""
+Add the (event_type_id, scheduled_at, id) index used to page through the
+meeting lists of one event type.
+"""
+from app.models import Meeting
+
+def upgrade(connection):
+    for index in Meeting.__table__.indexes:
+        if index.name == "ix_meetings_event_type_scheduled":
+            index.create(connection, checkfirst=True)
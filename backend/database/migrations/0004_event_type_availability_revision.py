@@ -0,0 +1,10 @@
+"""
+Add the availability revision counter of each event type, which versions
+its availability schedules for HTTP caching.
+"""
+from sqlalchemy import inspect, text
+
+def upgrade(connection):
+    columns = {column["name"] for column in inspect(connection).get_columns("event_types")}
+    if "availability_revision" not in columns:
+        connection.execute(text("ALTER TABLE event_types ADD COLUMN availability_revision INTEGER NOT NULL DEFAULT 0"))
@@ -0,0 +1,10 @@
+"""
+Add the (status, ends_at) index used by the job that marks meetings which
+have ended as completed.
+"""
+from app.models import Meeting
+
+def upgrade(connection):
+    for index in Meeting.__table__.indexes:
+        if index.name == "ix_meetings_status_ends_at":
+            index.create(connection, checkfirst=True)
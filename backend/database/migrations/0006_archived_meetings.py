@@ -0,0 +1,8 @@
+"""
+Add the archived_meetings table, the cold tier the archival job moves old
+completed and cancelled meetings to.
+"""
+from app.models import ArchivedMeeting
+
+def upgrade(connection):
+    ArchivedMeeting.__table__.create(connection, checkfirst=True)
@@ -0,0 +1,9 @@
+"""
+Add the booking_daily_rollups table and fill it from the existing meetings.
+"""
+from app.models import BookingRollup
+from app.services import booking_rollups
+
+def upgrade(connection):
+    BookingRollup.__table__.create(connection, checkfirst=True)
+    booking_rollups.rebuild(connection)
@@ -0,0 +1,17 @@
+"""
+Extend the (status, ends_at) index to (status, ends_at, scheduled_at), so the
+busy time lookup across every event type is answered from the index alone.
+"""
+from sqlalchemy import inspect, text
+from app.models import Meeting
+
+def upgrade(connection):
+    indexes = {index["name"] for index in inspect(connection).get_indexes("meetings")}
+    for index in Meeting.__table__.indexes:
+        if index.name == "ix_meetings_status_window":
+            index.create(connection, checkfirst=True)
+    if "ix_meetings_status_ends_at" in indexes:
+        if connection.dialect.name == "mysql":
+            connection.execute(text("DROP INDEX ix_meetings_status_ends_at ON meetings"))
+        else:
+            connection.execute(text("DROP INDEX ix_meetings_status_ends_at"))
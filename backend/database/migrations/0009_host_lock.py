@@ -0,0 +1,12 @@
+"""
+Add the host_locks table that bookings lock before checking availability,
+with its one row.
+"""
+from sqlalchemy import func, insert, select
+from app.models import HostLock
+from app.models.host_lock import HOST_LOCK_ID
+
+def upgrade(connection):
+    HostLock.__table__.create(connection, checkfirst=True)
+    if not connection.scalar(select(func.count()).select_from(HostLock).where(HostLock.id == HOST_LOCK_ID)):
+        connection.execute(insert(HostLock).values(id=HOST_LOCK_ID))
@@ -0,0 +1,11 @@
+"""
+Add the revision counter of each event type, which versions the event type
+itself for HTTP caching, as availability_revision (0004) versions its
+availability schedules.
+"""
+from sqlalchemy import inspect, text
+
+def upgrade(connection):
+    columns = {column["name"] for column in inspect(connection).get_columns("event_types")}
+    if "revision" not in columns:
+        connection.execute(text("ALTER TABLE event_types ADD COLUMN revision INTEGER NOT NULL DEFAULT 0"))
@@ -0,0 +1,41 @@
+"""
+Stop SQLite from reusing the ids of archived meetings.
+
+Without AUTOINCREMENT, SQLite gives a new row the largest id in the table
+plus one, so once the newest meetings are archived their ids come back and
+archiving the new meeting collides with the archived one. SQLite can't
+change a primary key in place, so the table is rebuilt with AUTOINCREMENT,
+and its counter starts after the largest id in either table. MySQL 8.0
+never reuses AUTO_INCREMENT values, so it needs nothing.
+"""
+from sqlalchemy import func, inspect, select, text
+from app.models import ArchivedMeeting, Meeting
+
+def upgrade(connection):
+    if connection.dialect.name != "sqlite":
+        return
+    table_sql = connection.scalar(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'meetings'"))
+    if "AUTOINCREMENT" in table_sql.upper():
+        return
+
+    columns = [
+        column["name"] for column in inspect(connection).get_columns("meetings")
+        if column["name"] in Meeting.__table__.columns
+    ]
+    connection.execute(text("ALTER TABLE meetings RENAME TO meetings_old"))
+    # The indexes moved with the table; free their names for the new one
+    for name in connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'meetings_old' AND sql IS NOT NULL"
+    )).scalars().all():
+        connection.execute(text(f'DROP INDEX "{name}"'))
+    Meeting.__table__.create(connection)
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    connection.execute(text(f"INSERT INTO meetings ({column_list}) SELECT {column_list} FROM meetings_old"))
+    connection.execute(text("DROP TABLE meetings_old"))
+
+    last_id = max(
+        connection.scalar(select(func.max(Meeting.id))) or 0,
+        connection.scalar(select(func.max(ArchivedMeeting.id))) or 0,
+    )
+    connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'meetings'"))
+    connection.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('meetings', :seq)"), {"seq": last_id})
@@ -0,0 +1,10 @@
+"""
+Drop the slot_claims table. Bookings take the host lock (0009) before they
+check the host's busy time, which already keeps them from overlapping, so
+the per-slot claims were a second mechanism guarding the same thing.
+"""
+from sqlalchemy import inspect, text
+
+def upgrade(connection):
+    if "slot_claims" in inspect(connection).get_table_names():
+        connection.execute(text("DROP TABLE slot_claims"))
@@ -0,0 +1,16 @@
+"""
+Drop the per-event-type overlap index from 0002. Busy time spans every event
+type of the host and is looked up on ix_meetings_status_window (0008), so no
+query uses it any more.
+"""
+from sqlalchemy import inspect, text
+
+OBSOLETE_INDEX = "ix_meetings_event_type_status_window"
+
+def upgrade(connection):
+    indexes = {index["name"] for index in inspect(connection).get_indexes("meetings")}
+    if OBSOLETE_INDEX in indexes:
+        if connection.dialect.name == "mysql":
+            connection.execute(text(f"DROP INDEX {OBSOLETE_INDEX} ON meetings"))
+        else:
+            connection.execute(text(f"DROP INDEX {OBSOLETE_INDEX}"))
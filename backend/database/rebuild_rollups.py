@@ -0,0 +1,26 @@
+"""
+Recompute the daily booking rollups from the meetings and archived meetings.
+
+The API keeps the rollups up to date as meetings are booked, cancelled and
+completed. Run this after changing meetings outside the API, e.g. with SQL
+or an import script, or to check the rollups haven't drifted.
+
+Run: python database/rebuild_rollups.py
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import app modules
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services import booking_rollups
+from database.database import engine
+
+def main():
+    with engine.begin() as connection:
+        rows = booking_rollups.rebuild(connection)
+    print(f"Rebuilt {rows} daily booking rollups.")
+
+if __name__ == "__main__":
+    main()
@@ -1,143 +1,456 @@
+"""
+Seed the database in DATABASE_URL.
+
+Without arguments, replaces the data with a small sample: three event types,
+their weekly availability and a few meetings.
+
+With --generate, builds a synthetic dataset of any size instead, for load
+and capacity testing. Rows are generated lazily and written with Core bulk
+inserts in batches, and the same --seed always produces the same data
+(relative to today's date).
+
+Run: python database/seed.py
+     python database/seed.py --generate --meetings 100000 --days-back 3650 \
+         --days-per-week 7 --hours-per-day 16 --durations 15,30
+"""
+import argparse
+import random
 import sys
+import time as timer
 from pathlib import Path
 
 # Add parent directory to path so we can import app modules
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.models import EventType, AvailabilitySchedule, Meeting, MeetingStatus
-from database.database import Base, DATABASE_URL
-from datetime import time, datetime, timedelta
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from app.models import ArchivedMeeting, BookingRollup, EventType, AvailabilitySchedule, Meeting, MeetingStatus
+from app.services import booking_rollups
+from database.database import Base, engine
+from datetime import date, time, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
 import pytz
 
-# Create database tables
-engine = create_engine(DATABASE_URL, echo=True)
-Base.metadata.create_all(bind=engine)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-db = SessionLocal()
-
-try:
-    # Clear existing data
-    db.query(Meeting).delete()
-    db.query(AvailabilitySchedule).delete()
-    db.query(EventType).delete()
-    db.commit()
-
-    # Create sample event types
-    event_type1 = EventType(
-        name="30 Minute Meeting",
-        duration_minutes=30,
-        slug="30min-meeting"
-    )
-    db.add(event_type1)
-    db.flush()
-
-    event_type2 = EventType(
-        name="1 Hour Consultation",
-        duration_minutes=60,
-        slug="1hour-consultation"
-    )
-    db.add(event_type2)
-    db.flush()
-
-    event_type3 = EventType(
-        name="15 Minute Quick Chat",
-        duration_minutes=15,
-        slug="15min-quick-chat"
-    )
-    db.add(event_type3)
-    db.flush()
-
-    # Create availability schedules for event_type1 (Monday-Friday, 9 AM - 5 PM)
-    for day in range(5):  # Monday to Friday (0-4)
-        availability = AvailabilitySchedule(
+# Durations the generated event types cycle through
+DEFAULT_DURATIONS = [15, 30, 45, 60]
+
+# Share of each status, before completed meetings in the future turn into scheduled ones
+DEFAULT_STATUS_MIX = "scheduled=70,completed=20,cancelled=10"
+
+def clear_data(connection) -> None:
+    """Delete every row the seed creates, children first"""
+    for model in (BookingRollup, ArchivedMeeting, Meeting, AvailabilitySchedule, EventType):
+        connection.execute(delete(model))
+
+def seed_sample_data() -> None:
+    """Replace the data with the sample event types, schedules and meetings"""
+    Base.metadata.create_all(bind=engine)
+    db = Session(bind=engine, autoflush=False)
+
+    try:
+        # Clear existing data
+        clear_data(db)
+        db.commit()
+
+        # Create sample event types
+        event_type1 = EventType(
+            name="30 Minute Meeting",
+            duration_minutes=30,
+            slug="30min-meeting"
+        )
+        db.add(event_type1)
+        db.flush()
+
+        event_type2 = EventType(
+            name="1 Hour Consultation",
+            duration_minutes=60,
+            slug="1hour-consultation"
+        )
+        db.add(event_type2)
+        db.flush()
+
+        event_type3 = EventType(
+            name="15 Minute Quick Chat",
+            duration_minutes=15,
+            slug="15min-quick-chat"
+        )
+        db.add(event_type3)
+        db.flush()
+
+        # Create availability schedules for event_type1 (Monday-Friday, 9 AM - 5 PM)
+        for day in range(5):  # Monday to Friday (0-4)
+            availability = AvailabilitySchedule(
+                event_type_id=event_type1.id,
+                day_of_week=day,
+                start_time=time(9, 0),
+                end_time=time(17, 0),
+                timezone="UTC"
+            )
+            db.add(availability)
+
+        # Create availability schedules for event_type2 (Monday, Wednesday, Friday, 10 AM - 3 PM)
+        for day in [0, 2, 4]:  # Monday, Wednesday, Friday
+            availability = AvailabilitySchedule(
+                event_type_id=event_type2.id,
+                day_of_week=day,
+                start_time=time(10, 0),
+                end_time=time(15, 0),
+                timezone="UTC"
+            )
+            db.add(availability)
+
+        # Create availability schedules for event_type3 (All weekdays, 8 AM - 6 PM)
+        for day in range(5):  # Monday to Friday
+            availability = AvailabilitySchedule(
+                event_type_id=event_type3.id,
+                day_of_week=day,
+                start_time=time(8, 0),
+                end_time=time(18, 0),
+                timezone="UTC"
+            )
+            db.add(availability)
+
+        # Create sample meetings
+        utc = pytz.UTC
+        now = datetime.now(utc)
+
+        # Upcoming meeting (tomorrow at 10 AM)
+        tomorrow = (now + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+        meeting1 = Meeting(
             event_type_id=event_type1.id,
-            day_of_week=day,
-            start_time=time(9, 0),
-            end_time=time(17, 0),
-            timezone="UTC"
+            invitee_name="John Doe",
+            invitee_email="john.doe@example.com",
+            scheduled_at=tomorrow,
+            ends_at=tomorrow + timedelta(minutes=event_type1.duration_minutes),
+            status=MeetingStatus.SCHEDULED
         )
-        db.add(availability)
+        db.add(meeting1)
 
-    # Create availability schedules for event_type2 (Monday, Wednesday, Friday, 10 AM - 3 PM)
-    for day in [0, 2, 4]:  # Monday, Wednesday, Friday
-        availability = AvailabilitySchedule(
+        # Upcoming meeting (day after tomorrow at 2 PM)
+        day_after = (now + timedelta(days=2)).replace(hour=14, minute=0, second=0, microsecond=0)
+        meeting2 = Meeting(
             event_type_id=event_type2.id,
-            day_of_week=day,
-            start_time=time(10, 0),
-            end_time=time(15, 0),
-            timezone="UTC"
+            invitee_name="Jane Smith",
+            invitee_email="jane.smith@example.com",
+            scheduled_at=day_after,
+            ends_at=day_after + timedelta(minutes=event_type2.duration_minutes),
+            status=MeetingStatus.SCHEDULED
+        )
+        db.add(meeting2)
+
+        # Past meeting (yesterday)
+        yesterday = (now - timedelta(days=1)).replace(hour=11, minute=0, second=0, microsecond=0)
+        meeting3 = Meeting(
+            event_type_id=event_type1.id,
+            invitee_name="Bob Johnson",
+            invitee_email="bob.johnson@example.com",
+            scheduled_at=yesterday,
+            ends_at=yesterday + timedelta(minutes=event_type1.duration_minutes),
+            status=MeetingStatus.COMPLETED
         )
-        db.add(availability)
+        db.add(meeting3)
 
-    # Create availability schedules for event_type3 (All weekdays, 8 AM - 6 PM)
-    for day in range(5):  # Monday to Friday
-        availability = AvailabilitySchedule(
+        # Past meeting (last week)
+        last_week = (now - timedelta(days=7)).replace(hour=15, minute=0, second=0, microsecond=0)
+        meeting4 = Meeting(
             event_type_id=event_type3.id,
-            day_of_week=day,
-            start_time=time(8, 0),
-            end_time=time(18, 0),
-            timezone="UTC"
+            invitee_name="Alice Williams",
+            invitee_email="alice.williams@example.com",
+            scheduled_at=last_week,
+            ends_at=last_week + timedelta(minutes=event_type3.duration_minutes),
+            status=MeetingStatus.COMPLETED
+        )
+        db.add(meeting4)
+        db.flush()
+
+        booking_rollups.rebuild(db.connection())
+        db.commit()
+        print("Database seeded successfully!")
+
+    except Exception as e:
+        db.rollback()
+        print(f"Error seeding database: {e}")
+        raise
+    finally:
+        db.close()
+
+def generate(
+    event_types: int = 10,
+    meetings: int = 10000,
+    days_back: int = 1095,
+    days_ahead: int = 365,
+    days_per_week: int = 5,
+    hours_per_day: int = 8,
+    windows_per_day: int = 1,
+    durations: Optional[List[int]] = None,
+    status_mix: Optional[Dict[MeetingStatus, float]] = None,
+    seed: int = 42,
+    batch_size: int = 10000,
+    quiet: bool = False
+) -> List[Tuple[int, str, int]]:
+    """
+    Replace the data with a synthetic dataset.
+
+    Every event type gets the same weekly availability: windows_per_day
+    windows totalling hours_per_day hours, from 08:00 with an hour between
+    windows, on the first days_per_week days of the week. Meetings are spread
+    evenly over the event types and placed on distinct slots of their grid
+    between days_back days ago and days_ahead days from now. The event types
+    share one host, so scheduled and completed meetings never overlap, whatever
+    their event type; cancelled ones can.
+
+    Returns the (id, slug, duration_minutes) of each event type.
+    """
+    durations = durations or DEFAULT_DURATIONS
+    status_mix = status_mix or parse_status_mix(DEFAULT_STATUS_MIX)
+    rng = random.Random(seed)
+
+    windows = _windows(hours_per_day, windows_per_day)
+    today = date.today()
+    first_day = today - timedelta(days=days_back)
+    days = [
+        first_day + timedelta(days=offset)
+        for offset in range(days_back + days_ahead)
+        if (first_day + timedelta(days=offset)).weekday() < days_per_week
+    ]
+
+    # Check every event type has room for its meetings before writing anything
+    for number in range(1, event_types + 1):
+        duration_minutes = durations[(number - 1) % len(durations)]
+        capacity = len(days) * len(_slot_times(windows, duration_minutes))
+        if _meeting_count(meetings, event_types, number - 1) > capacity:
+            raise ValueError(
+                f"Event types of {duration_minutes} minutes only have {capacity} slots in the date span; "
+                f"widen the span or the availability, or add event types"
+            )
+    placements = _place_meetings(rng, durations, event_types, meetings, days, windows, status_mix)
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        clear_data(connection)
+
+        connection.execute(insert(EventType), [
+            {
+                "name": f"Generated Event {number}",
+                "slug": f"generated-event-{number}",
+                "duration_minutes": durations[(number - 1) % len(durations)],
+            }
+            for number in range(1, event_types + 1)
+        ])
+        created = [tuple(row) for row in connection.execute(
+            select(EventType.id, EventType.slug, EventType.duration_minutes).order_by(EventType.id)
+        )]
+
+        connection.execute(insert(AvailabilitySchedule), [
+            {
+                "event_type_id": event_type_id,
+                "day_of_week": day_of_week,
+                "start_time": start_time,
+                "end_time": end_time,
+                "timezone": "UTC",
+            }
+            for event_type_id, _, _ in created
+            for day_of_week in range(days_per_week)
+            for start_time, end_time in windows
+        ])
+
+    started = timer.perf_counter()
+    written = 0
+    meeting_batch: List[dict] = []
+
+    def flush() -> None:
+        if meeting_batch:
+            with engine.begin() as connection:
+                connection.execute(insert(Meeting), meeting_batch)
+        meeting_batch.clear()
+
+    for (event_type_id, _, duration_minutes), placed in zip(created, placements):
+        for row in _meetings(event_type_id, duration_minutes, placed, days, written):
+            meeting_batch.append(row)
+            written += 1
+            if len(meeting_batch) >= batch_size:
+                flush()
+                if not quiet:
+                    print(f"  {written} meetings written ({written / (timer.perf_counter() - started):.0f}/s)")
+    flush()
+
+    # The meetings were inserted directly, so count them in one pass at the end
+    with engine.begin() as connection:
+        booking_rollups.rebuild(connection)
+
+    if not quiet:
+        print(f"Generated {len(created)} event types and {written} meetings in {timer.perf_counter() - started:.1f}s")
+    return created
+
+def parse_status_mix(value: str) -> Dict[MeetingStatus, float]:
+    """Parse weights like "scheduled=70,completed=20,cancelled=10" into shares of 1"""
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        try:
+            weights[MeetingStatus(name.strip().lower())] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid status weight: {part!r}")
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Status weights must add up to more than 0")
+    return {status: weight / total for status, weight in weights.items()}
+
+def _windows(hours_per_day: int, windows_per_day: int) -> List[Tuple[time, time]]:
+    """Split hours_per_day into windows from 08:00, an hour apart"""
+    minutes_per_window = hours_per_day * 60 // windows_per_day
+    if minutes_per_window <= 0 or 8 * 60 + hours_per_day * 60 + (windows_per_day - 1) * 60 > 24 * 60:
+        raise ValueError("The availability windows must fit between 08:00 and midnight")
+    windows = []
+    start = 8 * 60
+    for _ in range(windows_per_day):
+        end = start + minutes_per_window
+        windows.append((time(start // 60, start % 60), time(23, 59) if end == 24 * 60 else time(end // 60, end % 60)))
+        start = end + 60
+    return windows
+
+def _meeting_count(meetings: int, event_types: int, index: int) -> int:
+    """Number of meetings of the event type at index, spreading the remainder over the first ones"""
+    return meetings // event_types + (1 if index < meetings % event_types else 0)
+
+def _slot_times(windows: List[Tuple[time, time]], duration_minutes: int) -> List[time]:
+    """Start times of the grid slots in a day of availability"""
+    duration = timedelta(minutes=duration_minutes)
+    slot_times = []
+    for start_time, end_time in windows:
+        current = datetime.combine(date.min, start_time)
+        while current + duration <= datetime.combine(date.min, end_time):
+            slot_times.append(current.time())
+            current += duration
+    return slot_times
+
+def _place_meetings(
+    rng: random.Random,
+    durations: List[int],
+    event_types: int,
+    meetings: int,
+    days: List[date],
+    windows: List[Tuple[time, time]],
+    status_mix: Dict[MeetingStatus, float]
+) -> List[List[Tuple[int, time, MeetingStatus]]]:
+    """
+    Pick a grid slot and a status for every meeting, on one busy timeline
+    shared by the event types.
+
+    Returns the (day index, start time, status) of the meetings of each event
+    type, in chronological order.
+    """
+    statuses = list(status_mix)
+    weights = [status_mix[status] for status in statuses]
+    grids = [_slot_times(windows, durations[index % len(durations)]) for index in range(event_types)]
+    # Minutes of each day taken by scheduled and completed meetings
+    busy = [bytearray(24 * 60) for _ in days]
+    taken: List[set] = [set() for _ in range(event_types)]
+    placements: List[List[Tuple[int, time, MeetingStatus]]] = [[] for _ in range(event_types)]
+
+    # Place the meetings of all event types in random order, so none of them gets the emptiest timeline
+    order = [index for index in range(event_types) for _ in range(_meeting_count(meetings, event_types, index))]
+    rng.shuffle(order)
+    for index in order:
+        grid = grids[index]
+        duration_minutes = durations[index % len(durations)]
+        status = rng.choices(statuses, weights)[0]
+        blocks = status != MeetingStatus.CANCELLED
+
+        def is_free(slot: int) -> bool:
+            day, slot_time = divmod(slot, len(grid))
+            start = grid[slot_time].hour * 60 + grid[slot_time].minute
+            return slot not in taken[index] and not (blocks and any(busy[day][start:start + duration_minutes]))
+
+        # Random slots find room quickly until the timeline fills up; then look at every slot
+        capacity = len(days) * len(grid)
+        slot = next((slot for slot in (rng.randrange(capacity) for _ in range(20)) if is_free(slot)), None)
+        if slot is None:
+            first = rng.randrange(capacity)
+            slot = next((slot % capacity for slot in range(first, first + capacity) if is_free(slot % capacity)), None)
+        if slot is None:
+            raise ValueError(
+                f"Meetings of different event types fill the date span before all {meetings} fit; "
+                f"widen the span or the availability, or generate fewer meetings"
+            )
+
+        day, slot_time = divmod(slot, len(grid))
+        taken[index].add(slot)
+        if blocks:
+            start = grid[slot_time].hour * 60 + grid[slot_time].minute
+            busy[day][start:start + duration_minutes] = b"\x01" * duration_minutes
+        placements[index].append((day, grid[slot_time], status))
+
+    for placed in placements:
+        placed.sort(key=lambda placement: (placement[0], placement[1]))
+    return placements
+
+def _meetings(
+    event_type_id: int,
+    duration_minutes: int,
+    placements: List[Tuple[int, time, MeetingStatus]],
+    days: List[date],
+    offset: int
+) -> Iterator[dict]:
+    """Yield the rows of the meetings placed for one event type"""
+    duration = timedelta(minutes=duration_minutes)
+    now = datetime.now(pytz.UTC)
+
+    for number, (day, slot_time, status) in enumerate(placements, start=offset + 1):
+        scheduled_at = pytz.UTC.localize(datetime.combine(days[day], slot_time))
+        if status == MeetingStatus.COMPLETED and scheduled_at >= now:
+            status = MeetingStatus.SCHEDULED
+        yield {
+            "event_type_id": event_type_id,
+            "invitee_name": f"Invitee {number}",
+            "invitee_email": f"invitee{number}@example.com",
+            "scheduled_at": scheduled_at,
+            "ends_at": scheduled_at + duration,
+            "status": status,
+        }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the database with sample or generated data.")
+    parser.add_argument("--generate", action="store_true", help="generate a synthetic dataset instead of the sample")
+    parser.add_argument("--event-types", type=int, default=10, help="number of event types (default 10)")
+    parser.add_argument("--meetings", type=int, default=10000, help="number of meetings (default 10000)")
+    parser.add_argument("--days-back", type=int, default=1095, help="days of history before today (default 1095)")
+    parser.add_argument("--days-ahead", type=int, default=365, help="days from today on (default 365)")
+    parser.add_argument("--days-per-week", type=int, default=5, choices=range(1, 8), help="available days per week (default 5)")
+    parser.add_argument("--hours-per-day", type=int, default=8, help="available hours per day (default 8)")
+    parser.add_argument("--windows-per-day", type=int, default=1, help="availability windows per day (default 1)")
+    parser.add_argument("--durations", default=",".join(map(str, DEFAULT_DURATIONS)),
+                        help="meeting durations in minutes the event types cycle through (default 15,30,45,60)")
+    parser.add_argument("--status-mix", default=DEFAULT_STATUS_MIX,
+                        help=f"status weights; future meetings can't be completed (default {DEFAULT_STATUS_MIX})")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default 42)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows per insert batch (default 10000)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.generate:
+        seed_sample_data()
+        return
+
+    try:
+        generate(
+            event_types=args.event_types,
+            meetings=args.meetings,
+            days_back=args.days_back,
+            days_ahead=args.days_ahead,
+            days_per_week=args.days_per_week,
+            hours_per_day=args.hours_per_day,
+            windows_per_day=args.windows_per_day,
+            durations=[int(duration) for duration in args.durations.split(",")],
+            status_mix=parse_status_mix(args.status_mix),
+            seed=args.seed,
+            batch_size=args.batch_size,
         )
-        db.add(availability)
-
-    # Create sample meetings
-    utc = pytz.UTC
-    now = datetime.now(utc)
-    
-    # Upcoming meeting (tomorrow at 10 AM)
-    tomorrow = (now + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
-    meeting1 = Meeting(
-        event_type_id=event_type1.id,
-        invitee_name="John Doe",
-        invitee_email="john.doe@example.com",
-        scheduled_at=tomorrow,
-        status=MeetingStatus.SCHEDULED
-    )
-    db.add(meeting1)
-
-    # Upcoming meeting (day after tomorrow at 2 PM)
-    day_after = (now + timedelta(days=2)).replace(hour=14, minute=0, second=0, microsecond=0)
-    meeting2 = Meeting(
-        event_type_id=event_type2.id,
-        invitee_name="Jane Smith",
-        invitee_email="jane.smith@example.com",
-        scheduled_at=day_after,
-        status=MeetingStatus.SCHEDULED
-    )
-    db.add(meeting2)
-
-    # Past meeting (yesterday)
-    yesterday = (now - timedelta(days=1)).replace(hour=11, minute=0, second=0, microsecond=0)
-    meeting3 = Meeting(
-        event_type_id=event_type1.id,
-        invitee_name="Bob Johnson",
-        invitee_email="bob.johnson@example.com",
-        scheduled_at=yesterday,
-        status=MeetingStatus.COMPLETED
-    )
-    db.add(meeting3)
-
-    # Past meeting (last week)
-    last_week = (now - timedelta(days=7)).replace(hour=15, minute=0, second=0, microsecond=0)
-    meeting4 = Meeting(
-        event_type_id=event_type3.id,
-        invitee_name="Alice Williams",
-        invitee_email="alice.williams@example.com",
-        scheduled_at=last_week,
-        status=MeetingStatus.COMPLETED
-    )
-    db.add(meeting4)
-
-    db.commit()
-    print("Database seeded successfully!")
-
-except Exception as e:
-    db.rollback()
-    print(f"Error seeding database: {e}")
-    raise
-finally:
-    db.close()
+    except ValueError as e:
+        print(f"Error generating data: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
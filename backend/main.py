@@ -1,8 +1,39 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import event_types, availability, bookings, meetings
+from fastapi.responses import PlainTextResponse
+from app.api import event_types, availability, bookings, meetings, analytics
+from app.metrics import MetricsMiddleware, instrument_engine, metrics
+from app.services.event_type_cache import event_type_cache
+from app.services.schedule_cache import schedule_cache
+from app.services.single_flight import slot_flights
+from app.services.slot_cache import slot_cache
+from app.services.slot_events import slot_events
+from app.workers.meeting_archival import MEETING_ARCHIVE_INTERVAL_SECONDS, archive_old_meetings
+from app.workers.meeting_completion import MEETING_COMPLETION_INTERVAL_SECONDS, complete_past_meetings
+from app.workers.scheduler import run_periodically
+from database.database import async_engine, read_async_engine
 
-app = FastAPI(title="Calendly Clone API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background jobs completing ended meetings and archiving old ones
+    tasks = []
+    if MEETING_COMPLETION_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(run_periodically(
+            complete_past_meetings, MEETING_COMPLETION_INTERVAL_SECONDS, "Meetings marked as completed"
+        )))
+    if MEETING_ARCHIVE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(run_periodically(
+            archive_old_meetings, MEETING_ARCHIVE_INTERVAL_SECONDS, "Meetings archived"
+        )))
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+app = FastAPI(title="Calendly Clone API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -13,12 +44,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency and database metrics, served on /metrics
+app.add_middleware(MetricsMiddleware)
+instrument_engine(async_engine.sync_engine)
+if read_async_engine is not async_engine:
+    instrument_engine(read_async_engine.sync_engine)
+
 # Include routers
 app.include_router(event_types.router, prefix="/api/event-types", tags=["event-types"])
 app.include_router(availability.router, prefix="/api/availability", tags=["availability"])
 app.include_router(bookings.router, prefix="/api/bookings", tags=["bookings"])
 app.include_router(meetings.router, prefix="/api/meetings", tags=["meetings"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
 
 @app.get("/")
 def read_root():
     return {"message": "Calendly Clone API"}
+
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """Metrics of this process in the Prometheus text format"""
+    # Served on the event loop, which the slot event hub belongs to
+    event_stats = slot_events.stats()
+    flight_stats = slot_flights.stats()
+    return PlainTextResponse(
+        metrics.render({
+            "event_type": event_type_cache.stats(),
+            "schedule": schedule_cache.stats(),
+            "slot": slot_cache.stats(),
+        }, extra=[
+            ("slot_event_streams", "gauge", "Open slot event streams.", event_stats["size"]),
+            ("slot_events_published_total", "counter", "Slot events published.", event_stats["published"]),
+            ("slot_events_delivered_total", "counter", "Slot events queued to streams.", event_stats["delivered"]),
+            ("slot_queries_in_flight", "gauge", "Slot computations running.", flight_stats["in_flight"]),
+            ("slot_queries_started_total", "counter", "Slot computations started.", flight_stats["started"]),
+            ("slot_queries_coalesced_total", "counter", "Slot requests that joined a running computation.", flight_stats["coalesced"]),
+        ]),
+        media_type="text/plain; version=0.0.4"
+    )
@@ -9,7 +9,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from database.seed import *
+from database.seed import seed_sample_data
 
 if __name__ == "__main__":
     print("Setting up database...")
@@ -20,7 +20,8 @@ if __name__ == "__main__":
     print()
     
     try:
-        # The seed script will create tables and seed data
+        # Create the tables and seed the sample data
+        seed_sample_data()
         print("Database setup complete!")
     except Exception as e:
         print(f"Error: {e}")
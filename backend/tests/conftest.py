@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Point the app at a throwaway SQLite database before anything imports it
+_db_dir = tempfile.mkdtemp(prefix="calendly-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+
+# Add backend directory to path so we can import app modules
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import pytest
+from fastapi.testclient import TestClient
+from database.database import Base, engine
+from main import app
+from app.services.event_type_cache import event_type_cache
+from app.services.schedule_cache import schedule_cache
+from app.services.slot_cache import slot_cache
+
+@pytest.fixture
+def client():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    event_type_cache.clear()
+    schedule_cache.clear()
+    slot_cache.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def create_event_type(client):
+    """Create event types available 09:00-17:00 UTC every day"""
+    def create(slug="30min-meeting", duration_minutes=30):
+        event_type = client.post("/api/event-types/", json={
+            "name": f"{duration_minutes} Minute Meeting",
+            "duration_minutes": duration_minutes,
+            "slug": slug,
+        }).json()
+        client.post("/api/availability/bulk", json=[
+            {"event_type_id": event_type["id"], "day_of_week": day, "start_time": "09:00", "end_time": "17:00"}
+            for day in range(7)
+        ])
+        return event_type
+    return create
+
+@pytest.fixture
+def event_type(create_event_type):
+    return create_event_type()
+
+@pytest.fixture
+def available_slots(client):
+    """Get the slots an event type offers on a date"""
+    def get(slug, day, timezone="UTC"):
+        return client.get(f"/api/bookings/available/{slug}", params={
+            "date": day.isoformat(), "timezone": timezone
+        }).json()["available_slots"]
+    return get
+
+@pytest.fixture
+def book(client):
+    """Book a slot of an event type"""
+    def post(event_type_id, slot, invitee="invitee", timezone="UTC"):
+        return client.post("/api/bookings/", json={
+            "event_type_id": event_type_id,
+            "invitee_name": invitee,
+            "invitee_email": f"{invitee}@example.com",
+            "scheduled_at": slot,
+            "timezone": timezone,
+        })
+    return post
@@ -0,0 +1,116 @@
+from datetime import date, datetime, timedelta
+import pytz
+from app.services.booking_service import _generate_slots
+
+DAY = date(2030, 1, 7)
+
+def _at(hour, minute=0):
+    return pytz.UTC.localize(datetime.combine(DAY, datetime.min.time()) + timedelta(hours=hour, minutes=minute))
+
+def _slots(windows, busy, minutes=30):
+    return _generate_slots([(DAY, windows)], busy, timedelta(minutes=minutes))[DAY]
+
+def test_free_window_is_split_into_slots():
+    assert _slots([(_at(9), _at(11))], []) == [_at(9), _at(9, 30), _at(10), _at(10, 30)]
+
+def test_busy_time_removes_every_slot_it_overlaps():
+    # Off the grid: 9:40-10:10 blocks both the 9:30 and the 10:00 slot
+    assert _slots([(_at(9), _at(11))], [(_at(9, 40), _at(10, 10))]) == [_at(9), _at(10, 30)]
+
+def test_slots_stay_on_the_grid_of_their_window():
+    assert _slots([(_at(9), _at(10)), (_at(13, 15), _at(14, 15))], [(_at(13), _at(13, 20))]) == [
+        _at(9), _at(9, 30), _at(13, 45)
+    ]
+
+def test_busy_interval_spanning_two_windows_blocks_both():
+    windows = [(_at(9), _at(10)), (_at(11), _at(12))]
+    assert _slots(windows, [(_at(9, 30), _at(11, 30))]) == [_at(9), _at(11, 30)]
+
+def test_slots_that_do_not_fit_before_the_window_ends_are_dropped():
+    assert _slots([(_at(9), _at(10, 15))], [], minutes=45) == [_at(9)]
+
+def test_booking_accepts_a_slot_offered_in_its_timezone(event_type, available_slots, book):
+    slots = available_slots("30min-meeting", date.today() + timedelta(days=2), "America/New_York")
+
+    assert book(event_type["id"], slots[0], timezone="America/New_York").status_code == 201
+    assert book(event_type["id"], slots[0], timezone="America/New_York").status_code == 400
+
+def test_booking_rejects_an_unknown_timezone(event_type, available_slots, book):
+    slot = available_slots("30min-meeting", date.today() + timedelta(days=2))[0]
+
+    response = book(event_type["id"], slot, timezone="Mars/Base")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown timezone: Mars/Base"
+
+def test_completed_meetings_stay_busy(client, event_type, available_slots, book):
+    from app.workers.meeting_completion import complete_past_meetings
+
+    day = date.today() + timedelta(days=2)
+    slot = available_slots("30min-meeting", day)[0]
+    assert book(event_type["id"], slot).status_code == 201
+
+    # Complete it as the job would once the meeting has ended
+    assert client.portal.call(complete_past_meetings, 1000, datetime.now(pytz.UTC) + timedelta(days=7)) == 1
+    assert client.get("/api/meetings/", params={"status_filter": "completed"}).json()["items"]
+
+    assert slot not in available_slots("30min-meeting", day)
+    assert book(event_type["id"], slot).status_code == 400
+
+def test_rollups_fall_back_to_update_or_insert(client, event_type):
+    from sqlalchemy import select
+    from database.database import AsyncSessionLocal
+    from app.models.booking_rollup import BookingRollup
+    from app.models.meeting import MeetingStatus
+    from app.services.booking_rollups import _update_or_insert
+
+    day = date.today()
+
+    async def add_and_read():
+        async with AsyncSessionLocal() as db:
+            for count in (2, 3, -1):
+                await _update_or_insert(db, {
+                    "event_type_id": event_type["id"], "date": day, "status": MeetingStatus.SCHEDULED, "count": count
+                })
+            await db.commit()
+            return (await db.execute(select(BookingRollup.date, BookingRollup.count))).all()
+
+    assert client.portal.call(add_and_read) == [(day, 4)]
+
+def test_deleting_an_event_type_frees_the_time_of_its_meetings(client, event_type, create_event_type, available_slots, book):
+    create_event_type("other")
+    day = date.today() + timedelta(days=2)
+    slot = available_slots("other", day)[0]
+    assert book(event_type["id"], slot).status_code == 201
+    # Cached while the meeting still blocks it
+    assert slot not in available_slots("other", day)
+
+    assert client.delete(f"/api/event-types/{event_type['id']}").status_code == 204
+
+    assert slot in available_slots("other", day)
+
+def test_slots_of_a_date_range_are_grouped_by_date(client, event_type, available_slots):
+    start = date.today() + timedelta(days=2)
+    end = start + timedelta(days=2)
+
+    response = client.get("/api/bookings/available/30min-meeting", params={
+        "start_date": start.isoformat(), "end_date": end.isoformat(), "timezone": "America/New_York"
+    })
+    assert response.status_code == 200
+    slots_by_date = response.json()["available_slots"]
+    assert list(slots_by_date) == [(start + timedelta(days=offset)).isoformat() for offset in range(3)]
+    assert slots_by_date[start.isoformat()] == available_slots("30min-meeting", start, "America/New_York")
+
+def test_date_ranges_are_validated(client, event_type):
+    start = date.today()
+
+    def get(end, timezone="UTC"):
+        return client.get("/api/bookings/available/30min-meeting", params={
+            "start_date": start.isoformat(), "end_date": end.isoformat(), "timezone": timezone
+        })
+
+    assert get(start + timedelta(days=61)).status_code == 200
+    response = get(start + timedelta(days=62))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Date range must not exceed 62 days"
+    assert get(start - timedelta(days=1)).json()["detail"] == "start_date must not be after end_date"
+    assert get(start + timedelta(days=1), "Mars/Base").json()["detail"] == "Unknown timezone: Mars/Base"
@@ -0,0 +1,119 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+THREADS = 24
+
+def test_concurrent_bookings_of_one_slot_have_a_single_winner(client, event_type, available_slots, book):
+    day = date.today() + timedelta(days=1)
+    slot = available_slots("30min-meeting", day)[0]
+
+    barrier = threading.Barrier(THREADS)
+
+    def book_slot(index):
+        barrier.wait()
+        return book(event_type["id"], slot, f"invitee{index}").status_code
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        status_codes = list(pool.map(book_slot, range(THREADS)))
+
+    assert status_codes.count(201) == 1
+    assert set(status_codes) <= {201, 400, 409}
+
+    meetings = client.get("/api/meetings/", params={"status_filter": "scheduled"}).json()["items"]
+    assert [meeting["scheduled_at"][:19] for meeting in meetings] == [slot[:19]]
+    assert slot not in available_slots("30min-meeting", day)
+
+def test_cancelling_frees_the_slot(client, event_type, available_slots, book):
+    slot = available_slots("30min-meeting", date.today() + timedelta(days=1))[0]
+
+    meeting = book(event_type["id"], slot, "first").json()
+    assert book(event_type["id"], slot, "second").status_code == 400
+
+    assert client.put(f"/api/meetings/{meeting['id']}/cancel").status_code == 200
+    assert book(event_type["id"], slot, "second").status_code == 201
+
+def test_concurrent_bookings_of_different_event_types_have_a_single_winner(client, create_event_type, available_slots, book):
+    event_types = [create_event_type(f"{minutes}min", minutes) for minutes in (30, 60)]
+    day = date.today() + timedelta(days=1)
+    # Both event types offer 09:00, and a booking of either blocks the other
+    slot = available_slots("60min", day)[0]
+
+    barrier = threading.Barrier(THREADS)
+
+    def book_slot(index):
+        barrier.wait()
+        return book(event_types[index % 2]["id"], slot, f"invitee{index}").status_code
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        status_codes = list(pool.map(book_slot, range(THREADS)))
+
+    assert status_codes.count(201) == 1
+    assert set(status_codes) <= {201, 400, 409}
+    assert len(client.get("/api/meetings/", params={"status_filter": "scheduled"}).json()["items"]) == 1
+
+def test_losing_a_lock_to_another_transaction_is_a_conflict(event_type, available_slots, book, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+    from app.api import bookings
+
+    slot = available_slots("30min-meeting", date.today() + timedelta(days=1))[0]
+
+    async def deadlock(db):
+        raise OperationalError("UPDATE host_locks", {}, Exception(1213, "Deadlock found when trying to get lock"))
+
+    monkeypatch.setattr(bookings, "lock_host", deadlock)
+    response = book(event_type["id"], slot, "first")
+    assert response.status_code == 409
+    assert "retry" in response.json()["detail"]
+
+    monkeypatch.undo()
+    assert book(event_type["id"], slot, "first").status_code == 201
+
+def test_concurrent_requests_for_the_same_slots_share_one_computation(client, event_type, monkeypatch):
+    import asyncio
+    from sqlalchemy import event
+    from app.api import bookings
+    from app.services.single_flight import slot_flights
+    from database.database import read_async_engine
+
+    # Connections of the read engine checked out right now
+    connections = {"open": 0}
+    def checkout(*args):
+        connections["open"] += 1
+    def checkin(*args):
+        connections["open"] -= 1
+
+    compute = bookings.get_available_time_slots_for_range
+    open_while_computing = []
+
+    async def slow_compute(*args, **kwargs):
+        # Long enough for every request to join the flight
+        await asyncio.sleep(0.3)
+        slots = await compute(*args, **kwargs)
+        open_while_computing.append(connections["open"])
+        return slots
+
+    monkeypatch.setattr(bookings, "get_available_time_slots_for_range", slow_compute)
+    event.listen(read_async_engine.sync_engine, "checkout", checkout)
+    event.listen(read_async_engine.sync_engine, "checkin", checkin)
+    day = (date.today() + timedelta(days=3)).isoformat()
+    before = slot_flights.stats()
+    barrier = threading.Barrier(THREADS)
+
+    def get_slots(_):
+        barrier.wait()
+        return client.get("/api/bookings/available/30min-meeting", params={"date": day}).json()["available_slots"]
+
+    try:
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(get_slots, range(THREADS)))
+    finally:
+        event.remove(read_async_engine.sync_engine, "checkout", checkout)
+        event.remove(read_async_engine.sync_engine, "checkin", checkin)
+
+    after = slot_flights.stats()
+    assert after["started"] - before["started"] == 1
+    assert after["coalesced"] - before["coalesced"] == THREADS - 1
+    assert all(slots == results[0] and slots for slots in results)
+    # Only the computation holds a connection; the waiting requests gave theirs back
+    assert open_while_computing == [1]
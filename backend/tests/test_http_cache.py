@@ -0,0 +1,48 @@
+from sqlalchemy import update
+from database.database import AsyncSessionLocal
+from app.models.event_type import EventType
+
+def _update_through_another_worker(client, event_type_id, **values):
+    """Change an event type without invalidating this process's event type cache"""
+    async def change():
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(EventType).where(EventType.id == event_type_id).values(**values))
+            await db.commit()
+
+    client.portal.call(change)
+
+def test_event_type_is_revalidated_against_its_persisted_revision(client, event_type):
+    response = client.get("/api/event-types/slug/30min-meeting")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert client.get("/api/event-types/slug/30min-meeting", headers={"If-None-Match": etag}).status_code == 304
+
+    _update_through_another_worker(client, event_type["id"], name="Renamed", revision=EventType.revision + 1)
+
+    response = client.get("/api/event-types/slug/30min-meeting", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+    assert response.headers["ETag"] != etag
+    assert client.get(
+        "/api/event-types/slug/30min-meeting", headers={"If-None-Match": response.headers["ETag"]}
+    ).status_code == 304
+
+def test_updating_an_event_type_changes_its_etag(client, event_type):
+    etag = client.get("/api/event-types/slug/30min-meeting").headers["ETag"]
+
+    assert client.put(f"/api/event-types/{event_type['id']}", json={"name": "Renamed"}).status_code == 200
+
+    response = client.get("/api/event-types/slug/30min-meeting", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["revision"] == 1
+
+def test_availability_is_revalidated_against_its_persisted_revision(client, event_type):
+    url = f"/api/availability/event-type/{event_type['id']}"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    _update_through_another_worker(client, event_type["id"], availability_revision=EventType.availability_revision + 1)
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 7
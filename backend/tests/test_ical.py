@@ -0,0 +1,20 @@
+from datetime import date, timedelta
+
+def test_booking_fields_cannot_inject_calendar_lines(client, event_type, available_slots):
+    slot = available_slots("30min-meeting", date.today() + timedelta(days=1))[0]
+    response = client.post("/api/bookings/", json={
+        "event_type_id": event_type["id"],
+        "invitee_name": "Eve\r\nEND:VEVENT\r\nBEGIN:VEVENT\r\nSUMMARY:Injected\rX-LONE-CR:1",
+        "invitee_email": "e@e.com\r\nX-EVIL:1",
+        "scheduled_at": slot,
+    })
+    assert response.status_code == 201
+
+    feed = client.get(f"/api/event-types/{event_type['id']}/calendar.ics").text
+    # Unfold continuation lines before looking at the properties
+    lines = feed.replace("\r\n ", "").split("\r\n")
+
+    assert lines.count("BEGIN:VEVENT") == 1
+    assert not any(line.startswith(("SUMMARY:Injected", "X-EVIL", "X-LONE-CR")) for line in lines)
+    assert "\r" not in "".join(lines)
+    assert any(line.startswith("ATTENDEE;CN=\"Eve  END:VEVENT") and line.endswith(":mailto:e@e.com%0D%0AX-EVIL%3A1") for line in lines)
@@ -0,0 +1,93 @@
+from datetime import date, datetime, timedelta
+import pytz
+from sqlalchemy import func, insert, select
+from database.database import AsyncSessionLocal
+from app.models.archived_meeting import ArchivedMeeting
+from app.models.meeting import Meeting, MeetingStatus
+from app.workers.meeting_archival import archive_old_meetings
+
+def _add_meetings(client, event_type_id, statuses, days_ago):
+    """Insert meetings that started days_ago days ago, an hour apart, and return their ids"""
+    start = datetime.now(pytz.UTC).replace(minute=0, second=0, microsecond=0) - timedelta(days=days_ago)
+
+    async def add():
+        async with AsyncSessionLocal() as db:
+            ids = []
+            for number, meeting_status in enumerate(statuses):
+                scheduled_at = start + timedelta(hours=number)
+                ids.append(await db.scalar(insert(Meeting).values(
+                    event_type_id=event_type_id,
+                    invitee_name=f"Invitee {number}",
+                    invitee_email=f"invitee{number}@example.com",
+                    scheduled_at=scheduled_at,
+                    ends_at=scheduled_at + timedelta(minutes=30),
+                    status=meeting_status,
+                ).returning(Meeting.id)))
+            await db.commit()
+            return ids
+
+    return client.portal.call(add)
+
+def _count(client, model):
+    async def count():
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(select(func.count()).select_from(model))
+
+    return client.portal.call(count)
+
+def test_old_completed_and_cancelled_meetings_are_archived(client, event_type):
+    completed, cancelled, scheduled = _add_meetings(
+        client, event_type["id"], [MeetingStatus.COMPLETED, MeetingStatus.CANCELLED, MeetingStatus.SCHEDULED], 200
+    )
+    recent = _add_meetings(client, event_type["id"], [MeetingStatus.COMPLETED], 2)
+
+    assert client.portal.call(archive_old_meetings, 180, 1) == 2
+    assert client.portal.call(archive_old_meetings, 180, 1) == 0
+
+    assert _count(client, ArchivedMeeting) == 2
+    assert _count(client, Meeting) == 2
+    # Archived meetings are still found by their id
+    assert client.get(f"/api/meetings/{completed}").json()["status"] == "completed"
+    assert client.get(f"/api/meetings/{cancelled}").json()["status"] == "cancelled"
+    assert client.get(f"/api/meetings/{scheduled}").json()["status"] == "scheduled"
+    assert client.get(f"/api/meetings/{recent[0]}").status_code == 200
+
+def test_ids_of_archived_meetings_are_not_reused(client, event_type):
+    archived = _add_meetings(client, event_type["id"], [MeetingStatus.COMPLETED] * 2, 200)
+    assert client.portal.call(archive_old_meetings, 180) == 2
+
+    # The meetings table is empty now, so only AUTOINCREMENT keeps the ids apart
+    later = _add_meetings(client, event_type["id"], [MeetingStatus.COMPLETED], 190)
+    assert later[0] > max(archived)
+    assert client.portal.call(archive_old_meetings, 180) == 1
+
+def test_deleting_an_event_type_deletes_its_archived_meetings(client, event_type, create_event_type):
+    other = create_event_type("other")
+    _add_meetings(client, event_type["id"], [MeetingStatus.COMPLETED] * 2, 200)
+    _add_meetings(client, other["id"], [MeetingStatus.COMPLETED], 200)
+    assert client.portal.call(archive_old_meetings, 180) == 3
+
+    assert client.delete(f"/api/event-types/{event_type['id']}").status_code == 204
+
+    assert _count(client, ArchivedMeeting) == 1
+
+def test_past_meetings_are_paged_across_both_tiers(client, event_type):
+    statuses = [MeetingStatus.COMPLETED, MeetingStatus.CANCELLED] * 3
+    _add_meetings(client, event_type["id"], statuses, 200)
+    _add_meetings(client, event_type["id"], statuses, 2)
+    assert client.portal.call(archive_old_meetings, 180) == 6
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/meetings/past", params=params).json()
+        seen += page["items"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 12
+    assert len({meeting["id"] for meeting in seen}) == 12
+    starts = [meeting["scheduled_at"] for meeting in seen]
+    assert starts == sorted(starts, reverse=True)
+    assert date.fromisoformat(starts[5][:10]) > date.fromisoformat(starts[6][:10])
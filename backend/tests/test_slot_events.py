@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+import pytz
+from app.services.slot_events import RESYNC, SLOT_TAKEN, SlotEventHub, slot_events
+
+START = datetime(2030, 1, 7, tzinfo=pytz.UTC)
+
+def _kinds(subscription):
+    kinds = []
+    while not subscription.queue.empty():
+        kinds.append(subscription.queue.get_nowait().kind)
+    return kinds
+
+def test_changing_an_event_type_resyncs_its_streams(client, event_type, create_event_type):
+    other = create_event_type("other")
+    stream, other_stream = (
+        client.portal.call(slot_events.subscribe, event_type_id, START, START + timedelta(days=7))
+        for event_type_id in (event_type["id"], other["id"])
+    )
+    try:
+        assert client.put(f"/api/event-types/{event_type['id']}", json={"duration_minutes": 45}).status_code == 200
+        assert _kinds(stream) == [RESYNC]
+
+        assert client.delete(f"/api/event-types/{event_type['id']}").status_code == 204
+        assert _kinds(stream) == [RESYNC]
+        assert _kinds(other_stream) == []
+    finally:
+        slot_events.unsubscribe(stream)
+        slot_events.unsubscribe(other_stream)
+
+def test_only_queued_events_are_counted_as_delivered():
+    hub = SlotEventHub(queue_size=2)
+    subscription = hub.subscribe(1, START, START + timedelta(days=1))
+
+    for hour in range(5):
+        hub.publish_busy_change(SLOT_TAKEN, START + timedelta(hours=hour), START + timedelta(hours=hour, minutes=30))
+    # Outside the window of the stream
+    hub.publish_busy_change(SLOT_TAKEN, START + timedelta(days=2), START + timedelta(days=2, minutes=30))
+    hub.publish_resync(1)
+
+    assert hub.stats() == {"size": 1, "published": 7, "delivered": 2}
+    assert subscription.overflowed
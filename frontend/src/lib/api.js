@@ -36,22 +36,33 @@ export const availabilityAPI = {
   update: (id, data) => api.put(`/api/availability/${id}`, data),
   delete: (id) => api.delete(`/api/availability/${id}`),
   deleteAllForEventType: (eventTypeId) => api.delete(`/api/availability/event-type/${eventTypeId}`),
+  replaceForEventType: (eventTypeId, schedules) => api.put(`/api/availability/event-type/${eventTypeId}`, schedules),
 }
 
 // Bookings API
 export const bookingsAPI = {
   getAvailableSlots: (slug, date, timezone = 'UTC') => 
     api.get(`/api/bookings/available/${slug}`, { params: { date, timezone } }),
+  getAvailableSlotsRange: (slug, startDate, endDate, timezone = 'UTC') =>
+    api.get(`/api/bookings/available/${slug}`, { params: { start_date: startDate, end_date: endDate, timezone } }),
   create: (data) => api.post('/api/bookings', data),
+  // Open with EventSource; pushes slot_taken, slot_freed and resync events
+  slotEventsUrl: (slug, startDate, endDate, timezone = 'UTC') =>
+    `${API_BASE_URL}/api/bookings/available/${slug}/events?${new URLSearchParams({ start_date: startDate, end_date: endDate, timezone })}`,
 }
 
 // Meetings API
 export const meetingsAPI = {
   getAll: (params) => api.get('/api/meetings', { params }),
-  getUpcoming: () => api.get('/api/meetings/upcoming'),
-  getPast: () => api.get('/api/meetings/past'),
+  getUpcoming: (params) => api.get('/api/meetings/upcoming', { params }),
+  getPast: (params) => api.get('/api/meetings/past', { params }),
   getById: (id) => api.get(`/api/meetings/${id}`),
   cancel: (id) => api.put(`/api/meetings/${id}/cancel`),
 }
 
+// Analytics API
+export const analyticsAPI = {
+  getBookings: (params) => api.get('/api/analytics/bookings', { params }),
+}
+
 export default api
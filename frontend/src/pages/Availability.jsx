@@ -101,12 +101,15 @@ export default function Availability() {
 
   const handleTimezoneChange = async (newTimezone) => {
     setTimezone(newTimezone)
-    // Update all schedules with new timezone
+    // Update all schedules with new timezone in one request
     try {
-      const updates = availability.map(schedule =>
-        availabilityAPI.update(schedule.id, { ...schedule, timezone: newTimezone })
-      )
-      await Promise.all(updates)
+      const schedules = availability.map(({ day_of_week, start_time, end_time }) => ({
+        day_of_week,
+        start_time,
+        end_time,
+        timezone: newTimezone,
+      }))
+      await availabilityAPI.replaceForEventType(selectedEventType, schedules)
       fetchAvailability()
     } catch (err) {
       console.error('Error updating timezone:', err)
@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
-import { format } from 'date-fns'
+import { endOfMonth, format, startOfMonth } from 'date-fns'
 import { bookingsAPI, eventTypesAPI } from '../lib/api'
 import Calendar from '../components/Calendar'
 import TimeSlotPicker from '../components/TimeSlotPicker'
@@ -12,21 +12,55 @@ export default function BookingPage() {
   const [eventType, setEventType] = useState(null)
   const [selectedDate, setSelectedDate] = useState(null)
   const [selectedSlot, setSelectedSlot] = useState(null)
-  const [availableSlots, setAvailableSlots] = useState([])
+  const [slotsByDate, setSlotsByDate] = useState({})
   const [loading, setLoading] = useState(true)
   const [booking, setBooking] = useState(false)
   const [error, setError] = useState(null)
   const [timezone, setTimezone] = useState(Intl.DateTimeFormat().resolvedOptions().timeZone)
 
+  // Slots are loaded a month at a time, so picking another day of the month needs no request
+  const month = selectedDate ? format(selectedDate, 'yyyy-MM') : null
+  const availableSlots = selectedDate ? slotsByDate[format(selectedDate, 'yyyy-MM-dd')] || [] : []
+
   useEffect(() => {
     fetchEventType()
   }, [slug])
 
   useEffect(() => {
-    if (selectedDate && eventType) {
+    if (month && eventType) {
       fetchAvailableSlots()
     }
-  }, [selectedDate, eventType])
+  }, [month, eventType, timezone])
+
+  // Keep the slots of the month current while the page is open
+  useEffect(() => {
+    if (!month || !eventType) return
+
+    const [startDate, endDate] = monthRange(selectedDate)
+    const events = new EventSource(bookingsAPI.slotEventsUrl(slug, startDate, endDate, timezone))
+    const durationMs = eventType.duration_minutes * 60 * 1000
+
+    events.addEventListener('slot_taken', (event) => {
+      const { start, end } = JSON.parse(event.data)
+      const busyStart = new Date(start).getTime()
+      const busyEnd = new Date(end).getTime()
+      const overlaps = (slot) => {
+        const slotStart = new Date(slot).getTime()
+        return slotStart < busyEnd && slotStart + durationMs > busyStart
+      }
+      setSlotsByDate((slots) => Object.fromEntries(
+        Object.entries(slots).map(([day, daySlots]) => [day, daySlots.filter((slot) => !overlaps(slot))])
+      ))
+      setSelectedSlot((slot) => (slot && overlaps(slot) ? null : slot))
+    })
+    // Freed time may open slots only the server can work out, so refetch
+    events.addEventListener('slot_freed', () => fetchAvailableSlots())
+    // The event type itself may have changed or been deleted; reloading it
+    // refetches the slots as well
+    events.addEventListener('resync', () => fetchEventType())
+
+    return () => events.close()
+  }, [month, eventType, timezone])
 
   const fetchEventType = async () => {
     try {
@@ -44,12 +78,12 @@ export default function BookingPage() {
     if (!selectedDate) return
 
     try {
-      const dateStr = format(selectedDate, 'yyyy-MM-dd')
-      const response = await bookingsAPI.getAvailableSlots(slug, dateStr, timezone)
-      setAvailableSlots(response.data.available_slots || [])
+      const [startDate, endDate] = monthRange(selectedDate)
+      const response = await bookingsAPI.getAvailableSlotsRange(slug, startDate, endDate, timezone)
+      setSlotsByDate(response.data.available_slots || {})
     } catch (err) {
       console.error('Error fetching available slots:', err)
-      setAvailableSlots([])
+      setSlotsByDate({})
     }
   }
 
@@ -76,7 +110,8 @@ export default function BookingPage() {
         event_type_id: eventType.id,
         invitee_name: formData.name,
         invitee_email: formData.email,
-        scheduled_at: selectedSlot
+        scheduled_at: selectedSlot,
+        timezone
       }
 
       const response = await bookingsAPI.create(bookingData)
@@ -190,3 +225,8 @@ export default function BookingPage() {
     </div>
   )
 }
+
+// First and last day of the month of a date, as the range endpoint takes them
+function monthRange(date) {
+  return [format(startOfMonth(date), 'yyyy-MM-dd'), format(endOfMonth(date), 'yyyy-MM-dd')]
+}
@@ -12,10 +12,10 @@ export default function Dashboard() {
       try {
         const [eventTypesRes, meetingsRes] = await Promise.all([
           eventTypesAPI.getAll(),
-          meetingsAPI.getUpcoming()
+          meetingsAPI.getUpcoming({ limit: 5 })
         ])
         setEventTypes(eventTypesRes.data)
-        setUpcomingMeetings(meetingsRes.data.slice(0, 5)) // Show only first 5
+        setUpcomingMeetings(meetingsRes.data.items)
       } catch (error) {
         console.error('Error fetching dashboard data:', error)
       } finally {
@@ -5,19 +5,27 @@ import { format } from 'date-fns'
 export default function Meetings() {
   const [activeTab, setActiveTab] = useState('upcoming')
   const [meetings, setMeetings] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     fetchMeetings()
   }, [activeTab])
 
+  const fetchPage = (cursor) => {
+    const params = cursor ? { cursor } : {}
+    return activeTab === 'upcoming'
+      ? meetingsAPI.getUpcoming(params)
+      : meetingsAPI.getPast(params)
+  }
+
   const fetchMeetings = async () => {
     try {
       setLoading(true)
-      const response = activeTab === 'upcoming'
-        ? await meetingsAPI.getUpcoming()
-        : await meetingsAPI.getPast()
-      setMeetings(response.data)
+      const response = await fetchPage()
+      setMeetings(response.data.items)
+      setNextCursor(response.data.next_cursor)
     } catch (err) {
       console.error('Error fetching meetings:', err)
     } finally {
@@ -25,6 +33,19 @@ export default function Meetings() {
     }
   }
 
+  const fetchMoreMeetings = async () => {
+    try {
+      setLoadingMore(true)
+      const response = await fetchPage(nextCursor)
+      setMeetings((current) => [...current, ...response.data.items])
+      setNextCursor(response.data.next_cursor)
+    } catch (err) {
+      console.error('Error fetching meetings:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleCancel = async (id) => {
     if (!window.confirm('Are you sure you want to cancel this meeting?')) {
       return
@@ -144,6 +165,18 @@ export default function Meetings() {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="flex justify-center">
+          <button
+            onClick={fetchMoreMeetings}
+            disabled={loadingMore}
+            className="px-6 py-3 rounded-xl font-semibold text-sm bg-white text-gray-700 shadow-md border border-gray-100 hover:bg-gray-50 transition-colors disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   )
 }